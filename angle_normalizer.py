@@ -1,6 +1,15 @@
+import hashlib
 import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
+from dataclasses import dataclass
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to NumPy
+    NUMBA_AVAILABLE = False
 
 class ViewAngle(Enum):
     """Camera view angle types."""
@@ -10,21 +19,247 @@ class ViewAngle(Enum):
     ANGLED_VIEW = "angled_view"  # 30-60° or 120-150° (diagonal)
     UNKNOWN = "unknown"
 
+# Integer codes for ViewAngle used internally (cheap compares, numba-friendly)
+_SIDE, _FRONT, _BACK, _ANGLED, _UNKNOWN = range(5)
+_ANGLE_STR = (
+    ViewAngle.SIDE_VIEW.value,
+    ViewAngle.FRONT_VIEW.value,
+    ViewAngle.BACK_VIEW.value,
+    ViewAngle.ANGLED_VIEW.value,
+    ViewAngle.UNKNOWN.value,
+)
+_ANGLE_WARNINGS = (
+    None,
+    "Front view detected. Side view recommended for accurate analysis.",
+    "Back view detected. Side view recommended for accurate analysis.",
+    "Angled view detected. Side view (90°) recommended for best results.",
+    "Could not determine video angle. Side view recommended.",
+)
+
 class PersonOrientation(Enum):
     """Person's facing direction in side view."""
     FACING_LEFT = "facing_left"
     FACING_RIGHT = "facing_right"
     UNKNOWN = "unknown"
 
+# Keypoint order for the array representation (same order as PoseDetector)
+KEYPOINT_NAMES = (
+    'nose',
+    'left_shoulder',
+    'right_shoulder',
+    'left_elbow',
+    'right_elbow',
+    'left_wrist',
+    'right_wrist',
+    'left_hip',
+    'right_hip',
+    'left_knee',
+    'right_knee',
+    'left_ankle',
+    'right_ankle',
+)
+KEYPOINT_INDEX = {name: idx for idx, name in enumerate(KEYPOINT_NAMES)}
+
+_NOSE = KEYPOINT_INDEX['nose']
+_LEFT_SHOULDER = KEYPOINT_INDEX['left_shoulder']
+_RIGHT_SHOULDER = KEYPOINT_INDEX['right_shoulder']
+_LEFT_ANKLE = KEYPOINT_INDEX['left_ankle']
+_RIGHT_ANKLE = KEYPOINT_INDEX['right_ankle']
+
+# Coordinates stored for keypoints missing from a frame
+_MISSING_POINT = (np.nan, np.nan)
+
+# Number of frames sampled across the video for angle detection
+NUM_SAMPLE_FRAMES = 16
+
+# Number of recent detection results remembered per normalizer (keyed by sample content)
+DETECTION_CACHE_SIZE = 64
+
+# Keypoints whose visibility ratio feeds into angle detection
+_VISIBILITY_COLUMNS = np.array([_LEFT_ANKLE, _RIGHT_ANKLE, _NOSE])
+
+@dataclass
+class SampleStats:
+    """Sample-frame statistics shared by the angle and orientation detectors."""
+    avg_width: Optional[float] = None  # Mean horizontal shoulder distance
+    avg_depth: Optional[float] = None  # Mean vertical shoulder distance
+    left_ankle_vis: float = 0.0  # Fraction of frames with left ankle visible
+    right_ankle_vis: float = 0.0  # Fraction of frames with right ankle visible
+    nose_vis: float = 0.0  # Fraction of frames with nose visible
+    avg_nose_x: Optional[float] = None  # Mean nose x (frames with nose + both shoulders)
+    avg_shoulder_center_x: Optional[float] = None  # Mean shoulder center x (same frames)
+
+def keypoints_to_array(frames_keypoints: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a list of keypoint dictionaries to dense arrays.
+    
+    Args:
+        frames_keypoints: List of keypoint dictionaries for each frame (or a KeypointView)
+        
+    Returns:
+        Tuple of (coords, visible) where coords is a (F, K, 2) float32 array
+        with NaN for missing keypoints and visible is a (F, K) bool mask.
+    """
+    # Keypoints already held as arrays (a KeypointView from PoseDetector.process_video)
+    if hasattr(frames_keypoints, 'coords'):
+        return frames_keypoints.coords.copy(), frames_keypoints.visible.copy()
+    
+    # One row of points per frame, converted with a single array call
+    rows = [[frame.get(name) for name in KEYPOINT_NAMES] for frame in frames_keypoints]
+    shape = (len(rows), len(KEYPOINT_NAMES))
+    visible = np.array([[point is not None for point in row] for row in rows], dtype=bool).reshape(shape)
+    coords = np.array(
+        [[_MISSING_POINT if point is None else point for point in row] for row in rows], dtype=np.float32
+    ).reshape(shape + (2,))
+    
+    return coords, visible
+
+def _compute_stats_numpy(coords: np.ndarray, visible: np.ndarray) -> Tuple[float, ...]:
+    """
+    NumPy implementation of the sample-frame statistics kernel.
+    
+    Returns:
+        Tuple of (avg_width, avg_depth, left_ankle_vis, right_ankle_vis,
+        nose_vis, avg_nose_x, avg_shoulder_center_x). Averages are NaN when
+        no frame qualifies.
+    """
+    avg_width = avg_depth = avg_nose_x = avg_shoulder_x = np.nan
+    
+    # Shoulder width (horizontal) and depth (vertical) where both shoulders are visible
+    # (reduced with where= so masked rows are never copied out)
+    both_shoulders = visible[:, _LEFT_SHOULDER] & visible[:, _RIGHT_SHOULDER]
+    if both_shoulders.any():
+        shoulder_delta = np.abs(coords[:, _RIGHT_SHOULDER] - coords[:, _LEFT_SHOULDER])
+        avg_width, avg_depth = shoulder_delta.mean(axis=0, where=both_shoulders[:, None])
+    
+    # Nose vs shoulder center where nose and both shoulders are visible
+    usable = both_shoulders & visible[:, _NOSE]
+    if usable.any():
+        avg_nose_x = coords[:, _NOSE, 0].mean(where=usable)
+        avg_shoulder_x = ((coords[:, _LEFT_SHOULDER, 0] + coords[:, _RIGHT_SHOULDER, 0]) / 2).mean(where=usable)
+    
+    # Visibility ratios of all tracked columns with a single mask reduction
+    left_ankle_vis, right_ankle_vis, nose_vis = np.count_nonzero(
+        visible[:, _VISIBILITY_COLUMNS], axis=0
+    ) / len(visible)
+    
+    return (
+        float(avg_width),
+        float(avg_depth),
+        float(left_ankle_vis),
+        float(right_ankle_vis),
+        float(nose_vis),
+        float(avg_nose_x),
+        float(avg_shoulder_x),
+    )
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _compute_stats_numba(coords, visible):
+        """Single-pass compiled version of _compute_stats_numpy."""
+        num_frames = coords.shape[0]
+        width_sum = 0.0
+        depth_sum = 0.0
+        shoulder_count = 0
+        nose_x_sum = 0.0
+        shoulder_x_sum = 0.0
+        usable_count = 0
+        left_ankle_count = 0
+        right_ankle_count = 0
+        nose_count = 0
+        
+        for f in range(num_frames):
+            if visible[f, _LEFT_ANKLE]:
+                left_ankle_count += 1
+            if visible[f, _RIGHT_ANKLE]:
+                right_ankle_count += 1
+            if visible[f, _NOSE]:
+                nose_count += 1
+            
+            if visible[f, _LEFT_SHOULDER] and visible[f, _RIGHT_SHOULDER]:
+                left_x = coords[f, _LEFT_SHOULDER, 0]
+                right_x = coords[f, _RIGHT_SHOULDER, 0]
+                width_sum += abs(right_x - left_x)
+                depth_sum += abs(coords[f, _RIGHT_SHOULDER, 1] - coords[f, _LEFT_SHOULDER, 1])
+                shoulder_count += 1
+                
+                if visible[f, _NOSE]:
+                    nose_x_sum += coords[f, _NOSE, 0]
+                    shoulder_x_sum += (left_x + right_x) / 2
+                    usable_count += 1
+        
+        avg_width = np.nan
+        avg_depth = np.nan
+        if shoulder_count > 0:
+            avg_width = width_sum / shoulder_count
+            avg_depth = depth_sum / shoulder_count
+        
+        avg_nose_x = np.nan
+        avg_shoulder_x = np.nan
+        if usable_count > 0:
+            avg_nose_x = nose_x_sum / usable_count
+            avg_shoulder_x = shoulder_x_sum / usable_count
+        
+        left_ankle_vis = 0.0
+        right_ankle_vis = 0.0
+        nose_vis = 0.0
+        if num_frames > 0:
+            left_ankle_vis = left_ankle_count / num_frames
+            right_ankle_vis = right_ankle_count / num_frames
+            nose_vis = nose_count / num_frames
+        
+        return (avg_width, avg_depth, left_ankle_vis, right_ankle_vis,
+                nose_vis, avg_nose_x, avg_shoulder_x)
+    
+    _compute_stats = _compute_stats_numba
+    
+    # Compile at import time so the first analysis request doesn't pay for it
+    _compute_stats(
+        np.zeros((1, len(KEYPOINT_NAMES), 2), dtype=np.float32),
+        np.zeros((1, len(KEYPOINT_NAMES)), dtype=bool)
+    )
+else:
+    _compute_stats = _compute_stats_numpy
+
+def array_to_keypoints(frame_coords: np.ndarray, frame_visible: np.ndarray) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Convert one frame of the dense arrays back to a keypoint dictionary.
+    
+    Args:
+        frame_coords: (K, 2) keypoint coordinates of the frame
+        frame_visible: (K,) keypoint visibility mask of the frame
+        
+    Returns:
+        Dictionary with keypoint names and (x, y) coordinates or None
+    """
+    return {
+        name: tuple(point) if is_visible else None
+        for name, point, is_visible in zip(KEYPOINT_NAMES, frame_coords.tolist(), frame_visible.tolist())
+    }
+
+def _mirror_name(name: str) -> str:
+    """Return the keypoint name on the opposite side of the body."""
+    if name.startswith('left_'):
+        return 'right_' + name[len('left_'):]
+    if name.startswith('right_'):
+        return 'left_' + name[len('right_'):]
+    return name
+
 class AngleNormalizer:
     """Detects video angle and normalizes keypoints for consistent analysis."""
     
+    # Entry i is the index of the keypoint that mirrors keypoint i (left <-> right)
+    _LR_SWAP_PERM = np.array([KEYPOINT_INDEX[_mirror_name(name)] for name in KEYPOINT_NAMES])
+    
     def __init__(self):
         self.detected_angle = None
         self.detected_orientation = None
         self.rotation_angle = 0.0
+        self._angle_info = None
+        # Maps a hash of the sample keypoints to (detected_angle, detected_orientation)
+        self._detection_cache = OrderedDict()
     
-    def detect_and_normalize(self, frames_keypoints: List[Dict]) -> List[Dict]:
+    def detect_and_normalize(self, frames_keypoints: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """
         Detect video angle and normalize all keypoints.
         
@@ -32,57 +267,97 @@ class AngleNormalizer:
             frames_keypoints: List of keypoint dictionaries for each frame
             
         Returns:
-            Normalized list of keypoint dictionaries
+            Tuple of normalized (coords, visible) arrays, see keypoints_to_array
         """
-        if len(frames_keypoints) == 0:
-            return frames_keypoints
-        
-        # Use first few frames (standing position) for angle detection
-        sample_frames = frames_keypoints[:min(10, len(frames_keypoints))]
+        # Clear results from any previously processed video
+        self.detected_angle = None
+        self.detected_orientation = None
+        self._angle_info = None
         
-        # Detect view angle
-        self.detected_angle = self._detect_view_angle(sample_frames)
+        # Convert once; detection and normalization both work on the arrays
+        coords, visible = keypoints_to_array(frames_keypoints)
         
-        # Detect person orientation (for side views)
-        if self.detected_angle == ViewAngle.SIDE_VIEW:
-            self.detected_orientation = self._detect_orientation(sample_frames)
+        if len(frames_keypoints) == 0:
+            return coords, visible
+        
+        # Sample frames evenly across the whole video for angle detection,
+        # so setup motion at the start doesn't dominate the estimate
+        num_frames = len(frames_keypoints)
+        sample_idx = np.linspace(0, num_frames - 1, num=min(NUM_SAMPLE_FRAMES, num_frames), dtype=int)
+        sample_coords, sample_visible = coords[sample_idx], visible[sample_idx]
+        
+        # Re-analyzing the same video (retries, re-ratings) yields identical
+        # samples, so reuse the previous detection result when we have one
+        cache_key = self._sample_key(sample_coords, sample_visible)
+        cached = self._detection_cache.get(cache_key)
+        
+        if cached is not None:
+            self._detection_cache.move_to_end(cache_key)
+            self.detected_angle, self.detected_orientation = cached
+        else:
+            # Gather everything the detectors need in one pass over the sample
+            stats = self._collect_stats(sample_coords, sample_visible)
+            
+            # Detect view angle
+            self.detected_angle = self._detect_view_angle(stats)
+            
+            # Detect person orientation (for side views)
+            if self.detected_angle == _SIDE:
+                self.detected_orientation = self._detect_orientation(stats)
+            
+            self._detection_cache[cache_key] = (self.detected_angle, self.detected_orientation)
+            if len(self._detection_cache) > DETECTION_CACHE_SIZE:
+                self._detection_cache.popitem(last=False)
         
         # Normalize keypoints
-        normalized_frames = self._normalize_keypoints(frames_keypoints)
+        return self._normalize_keypoints(coords, visible)
+    
+    def _sample_key(self, coords: np.ndarray, visible: np.ndarray) -> str:
+        """Content hash of the sample arrays used to memoize detection results."""
+        digest = hashlib.blake2b(coords.tobytes(), digest_size=16)
+        digest.update(visible.tobytes())
+        return digest.hexdigest()
+    
+    def _collect_stats(self, coords: np.ndarray, visible: np.ndarray) -> SampleStats:
+        """
+        Compute all sample-frame statistics used for angle/orientation detection.
         
-        return normalized_frames
+        Args:
+            coords: (F, K, 2) keypoint coordinates of the sample frames
+            visible: (F, K) keypoint visibility mask of the sample frames
+            
+        Returns:
+            SampleStats with averaged shoulder geometry, nose position and
+            visibility ratios. Averages are None when no frame qualifies.
+        """
+        if len(coords) == 0:
+            return SampleStats()
+        
+        (avg_width, avg_depth, left_ankle_vis, right_ankle_vis,
+         nose_vis, avg_nose_x, avg_shoulder_x) = _compute_stats(coords, visible)
+        
+        return SampleStats(
+            avg_width=None if np.isnan(avg_width) else avg_width,
+            avg_depth=None if np.isnan(avg_depth) else avg_depth,
+            left_ankle_vis=left_ankle_vis,
+            right_ankle_vis=right_ankle_vis,
+            nose_vis=nose_vis,
+            avg_nose_x=None if np.isnan(avg_nose_x) else avg_nose_x,
+            avg_shoulder_center_x=None if np.isnan(avg_shoulder_x) else avg_shoulder_x,
+        )
     
-    def _detect_view_angle(self, sample_frames: List[Dict]) -> ViewAngle:
+    def _detect_view_angle(self, stats: SampleStats) -> int:
         """
         Detect the camera view angle based on keypoint relationships.
         
         Uses shoulder width vs depth, and visibility patterns.
+        Returns one of the _SIDE/_FRONT/_BACK/_ANGLED/_UNKNOWN codes.
         """
-        if not sample_frames:
-            return ViewAngle.UNKNOWN
-        
-        # Get average shoulder positions
-        shoulder_widths = []
-        shoulder_depths = []
-        
-        for frame in sample_frames:
-            left_shoulder = frame.get('left_shoulder')
-            right_shoulder = frame.get('right_shoulder')
-            
-            if left_shoulder and right_shoulder:
-                # Horizontal distance (width)
-                width = abs(right_shoulder[0] - left_shoulder[0])
-                shoulder_widths.append(width)
-                
-                # Vertical distance (depth indicator in side view)
-                depth = abs(right_shoulder[1] - left_shoulder[1])
-                shoulder_depths.append(depth)
-        
-        if not shoulder_widths:
-            return ViewAngle.UNKNOWN
+        if stats.avg_width is None:
+            return _UNKNOWN
         
-        avg_width = np.mean(shoulder_widths)
-        avg_depth = np.mean(shoulder_depths) if shoulder_depths else 0
+        avg_width = stats.avg_width
+        avg_depth = stats.avg_depth
         
         # Calculate width-to-depth ratio
         # Side view: width is small, depth is small (shoulders overlap)
@@ -91,67 +366,33 @@ class AngleNormalizer:
         
         width_depth_ratio = avg_width / (avg_depth + 0.001)  # Avoid division by zero
         
-        # Check ankle visibility pattern
-        ankle_visibility = self._check_ankle_visibility(sample_frames)
-        
         # Determine view angle
         if avg_width < 0.05:  # Very narrow shoulders = side view
-            return ViewAngle.SIDE_VIEW
+            return _SIDE
         elif width_depth_ratio > 10:  # Very wide shoulders = front/back view
             # Distinguish front vs back by checking nose visibility
-            if self._check_nose_visibility(sample_frames):
-                return ViewAngle.FRONT_VIEW
+            if stats.nose_vis > 0.5:
+                return _FRONT
             else:
-                return ViewAngle.BACK_VIEW
+                return _BACK
         elif 0.05 <= avg_width <= 0.15:  # Medium width = angled view
-            return ViewAngle.ANGLED_VIEW
+            return _ANGLED
         else:
-            return ViewAngle.UNKNOWN
-    
-    def _check_ankle_visibility(self, sample_frames: List[Dict]) -> Dict[str, float]:
-        """Check visibility of ankles to help determine angle."""
-        left_visible = sum(1 for f in sample_frames if f.get('left_ankle') is not None)
-        right_visible = sum(1 for f in sample_frames if f.get('right_ankle') is not None)
-        
-        return {
-            'left': left_visible / len(sample_frames) if sample_frames else 0,
-            'right': right_visible / len(sample_frames) if sample_frames else 0
-        }
+            return _UNKNOWN
     
-    def _check_nose_visibility(self, sample_frames: List[Dict]) -> bool:
-        """Check if nose is visible (indicates front view)."""
-        nose_visible = sum(1 for f in sample_frames if f.get('nose') is not None)
-        return nose_visible / len(sample_frames) > 0.5 if sample_frames else False
-    
-    def _detect_orientation(self, sample_frames: List[Dict]) -> PersonOrientation:
+    def _detect_orientation(self, stats: SampleStats) -> PersonOrientation:
         """
         Detect if person is facing left or right in side view.
         
         Uses nose position relative to shoulders.
         """
-        if not sample_frames:
-            return PersonOrientation.UNKNOWN
-        
-        nose_positions = []
-        shoulder_centers = []
-        
-        for frame in sample_frames:
-            nose = frame.get('nose')
-            left_shoulder = frame.get('left_shoulder')
-            right_shoulder = frame.get('right_shoulder')
-            
-            if nose and left_shoulder and right_shoulder:
-                nose_positions.append(nose[0])  # x-coordinate
-                shoulder_center = (left_shoulder[0] + right_shoulder[0]) / 2
-                shoulder_centers.append(shoulder_center)
-        
-        if not nose_positions:
+        if stats.avg_nose_x is None:
             return PersonOrientation.UNKNOWN
         
         # Compare nose x-position to shoulder center
         # If nose is to the left of shoulders, person is facing left
-        avg_nose_x = np.mean(nose_positions)
-        avg_shoulder_x = np.mean(shoulder_centers)
+        avg_nose_x = stats.avg_nose_x
+        avg_shoulder_x = stats.avg_shoulder_center_x
         
         if avg_nose_x < avg_shoulder_x - 0.02:  # Nose significantly left
             return PersonOrientation.FACING_LEFT
@@ -160,105 +401,67 @@ class AngleNormalizer:
         else:
             return PersonOrientation.UNKNOWN
     
-    def _normalize_keypoints(self, frames_keypoints: List[Dict]) -> List[Dict]:
+    def _normalize_keypoints(self, coords: np.ndarray, visible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Normalize keypoints based on detected angle and orientation.
         
         For side views: Flip horizontally if facing right to standardize to facing left
         For angled views: Attempt to rotate/transform coordinates
-        """
-        normalized = []
         
-        for frame in frames_keypoints:
-            normalized_frame = frame.copy()
-            
-            if self.detected_angle == ViewAngle.SIDE_VIEW:
-                # Normalize side view: flip if facing right
-                if self.detected_orientation == PersonOrientation.FACING_RIGHT:
-                    normalized_frame = self._flip_horizontal(normalized_frame)
-            
-            elif self.detected_angle == ViewAngle.ANGLED_VIEW:
-                # For angled views, try to estimate rotation and correct
-                normalized_frame = self._correct_angled_view(normalized_frame)
-            
-            elif self.detected_angle in [ViewAngle.FRONT_VIEW, ViewAngle.BACK_VIEW]:
-                # Front/back views are not ideal, but we can still try to analyze
-                # by using depth estimation or warning the user
-                pass  # Keep as-is but will warn in analysis
-            
-            normalized.append(normalized_frame)
-        
-        return normalized
+        Arrays are only modified when they are actually transformed; otherwise
+        they are returned as-is.
+        """
+        if self.detected_angle == _SIDE:
+            # Normalize side view: flip if facing right
+            if self.detected_orientation == PersonOrientation.FACING_RIGHT:
+                return self._flip_horizontal(coords, visible)
+        
+        elif self.detected_angle == _ANGLED:
+            # For angled views, try to estimate rotation and correct
+            return self._correct_angled_view(coords, visible)
+        
+        # Front/back views are not ideal, but we can still try to analyze
+        # by using depth estimation or warning the user
+        return coords, visible
     
-    def _flip_horizontal(self, keypoints: Dict) -> Dict:
-        """Flip keypoints horizontally (mirror image)."""
-        flipped = {}
-        
-        for key, value in keypoints.items():
-            if value is not None:
-                # Flip x-coordinate: x_new = 1 - x_old
-                flipped[key] = (1.0 - value[0], value[1])
-            else:
-                flipped[key] = None
+    def _flip_horizontal(self, coords: np.ndarray, visible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Flip keypoints of all frames horizontally (mirror image)."""
+        # Flip x-coordinate in place for every frame at once: x_new = 1 - x_old
+        x = coords[..., 0]
+        np.subtract(1.0, x, out=x)
         
         # Swap left/right keypoints
-        swap_pairs = [
-            ('left_shoulder', 'right_shoulder'),
-            ('left_elbow', 'right_elbow'),
-            ('left_wrist', 'right_wrist'),
-            ('left_hip', 'right_hip'),
-            ('left_knee', 'right_knee'),
-            ('left_ankle', 'right_ankle'),
-        ]
-        
-        for left_key, right_key in swap_pairs:
-            if left_key in flipped and right_key in flipped:
-                flipped[left_key], flipped[right_key] = flipped[right_key], flipped[left_key]
-        
-        return flipped
+        return coords[:, self._LR_SWAP_PERM], visible[:, self._LR_SWAP_PERM]
     
-    def _correct_angled_view(self, keypoints: Dict) -> Dict:
+    def _correct_angled_view(self, coords: np.ndarray, visible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Attempt to correct angled view by estimating rotation angle.
         
         Uses ankle positions to estimate ground plane and correct perspective.
         """
         # This is a simplified approach - could be enhanced with more sophisticated
-        # perspective correction algorithms
-        
-        left_ankle = keypoints.get('left_ankle')
-        right_ankle = keypoints.get('right_ankle')
-        
-        if left_ankle and right_ankle:
-            # Estimate rotation based on ankle alignment
-            # In a perfect side view, ankles should have similar y-coordinates
-            ankle_y_diff = abs(left_ankle[1] - right_ankle[1])
-            
-            # If difference is large, there's significant rotation
-            # We could apply a correction, but for now, just return as-is
-            # A more sophisticated approach would use homography transformation
-            pass
-        
-        return keypoints
+        # perspective correction algorithms.
+        # In a perfect side view, ankles should have similar y-coordinates; a large
+        # difference indicates significant rotation. We could apply a correction
+        # (e.g. a homography transformation), but for now keypoints are returned as-is.
+        return coords, visible
     
     def get_angle_info(self) -> Dict:
         """Get information about detected angle and orientation."""
-        return {
-            'view_angle': self.detected_angle.value if self.detected_angle else None,
-            'orientation': self.detected_orientation.value if self.detected_orientation else None,
-            'is_ideal': self.detected_angle == ViewAngle.SIDE_VIEW,
-            'warning': self._get_angle_warning()
-        }
-    
-    def _get_angle_warning(self) -> Optional[str]:
-        """Get warning message if angle is not ideal."""
-        if self.detected_angle == ViewAngle.FRONT_VIEW:
-            return "Front view detected. Side view recommended for accurate analysis."
-        elif self.detected_angle == ViewAngle.BACK_VIEW:
-            return "Back view detected. Side view recommended for accurate analysis."
-        elif self.detected_angle == ViewAngle.ANGLED_VIEW:
-            return "Angled view detected. Side view (90°) recommended for best results."
-        elif self.detected_angle == ViewAngle.UNKNOWN:
-            return "Could not determine video angle. Side view recommended."
-        return None
-
+        # Detection results don't change until the next detect_and_normalize call
+        if self._angle_info is None:
+            if self.detected_angle is None:
+                view_angle, warning = None, None
+            else:
+                view_angle = _ANGLE_STR[self.detected_angle]
+                warning = _ANGLE_WARNINGS[self.detected_angle]
+            
+            self._angle_info = {
+                'view_angle': view_angle,
+                'orientation': self.detected_orientation.value if self.detected_orientation else None,
+                'is_ideal': self.detected_angle == _SIDE,
+                'warning': warning
+            }
+        
+        # A copy, since callers store the result and may modify it
+        return dict(self._angle_info)
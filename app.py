@@ -1,72 +1,173 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, render_template, send_from_directory
+import orjson
 import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from werkzeug.utils import secure_filename
 from form_analyzer import FormAnalyzer
 from rating_calculator import RatingCalculator
 
+ALLOWED_EXTENSIONS = frozenset({'mp4', 'avi', 'mov', 'mkv', 'webm'})
+
+# Buffer size used when copying uploaded video streams to disk
+COPY_BUFFER_SIZE = 1 << 20  # 1MB
+
+# Number of analysis processes (each loads its own pose model); defaults to the CPU count
+WORKERS_ENV = 'SQUATFORM_WORKERS'
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['ALLOWED_EXTENSIONS'] = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
+app.config['ALLOWED_EXTENSIONS'] = ALLOWED_EXTENSIONS
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Analyses run in a process pool so concurrent uploads get real CPU
+# parallelism and a long analysis doesn't block the Flask worker.
+# Each pool process builds its own analyzer (loads the pose model) and
+# rating calculator once in _init_worker and reuses them for every job.
+_analyzer = None
+_rating_calc = None
+
+def _init_worker():
+    """Create the per-process analyzer and rating calculator."""
+    global _analyzer, _rating_calc
+    _analyzer = FormAnalyzer()
+    _rating_calc = RatingCalculator()
+
+def _run_pipeline(filepath, filename):
+    """Analyze a saved video and build the JSON-ready results (runs in a pool process)."""
+    analysis_results = _analyzer.analyze_squat(filepath)
+    
+    # Calculate overall rating
+    final_results = _rating_calc.calculate_overall_rating(analysis_results)
+    
+    # Add video info and angle information
+    final_results['video_filename'] = filename
+    if 'video_angle' in analysis_results:
+        final_results['video_angle'] = analysis_results['video_angle']
+    if 'angle_warning' in analysis_results:
+        final_results['angle_warning'] = analysis_results['angle_warning']
+    # Add snapshots if available
+    if 'snapshots' in analysis_results:
+        final_results['snapshots'] = analysis_results['snapshots']
+    
+    return final_results
+
+# The pool is started on the first analysis rather than at import, and
+# replaced if one of its processes dies
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """Return the analysis process pool, starting it if needed."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.environ.get(WORKERS_ENV, 0)) or os.cpu_count()
+            _executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        return _executor
+
+def _discard_executor(executor):
+    """Drop a broken pool so the next analysis starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        # Another request may already have replaced it
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def ojsonify(obj):
+    """Serialize obj to a JSON response with orjson (handles NumPy values natively)."""
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+
 def allowed_file(filename):
     """Check if file extension is allowed."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+    ext = os.path.splitext(filename)[1]
+    return ext[1:].lower() in ALLOWED_EXTENSIONS if ext else False
+
+def allowed_mimetype(mimetype):
+    """Check if the uploaded part's declared content type can be a video."""
+    # Some browsers send a generic type (or none) for containers like mkv
+    return not mimetype or mimetype.startswith('video/') or mimetype == 'application/octet-stream'
+
+# Rendered landing page, cached after the first request (outside debug mode)
+_index_html = None
 
 @app.route('/')
 def index():
     """Serve the main page."""
-    return render_template('index.html')
+    global _index_html
+    if app.debug:
+        # Re-render every time so template edits show up while developing
+        return render_template('index.html')
+    if _index_html is None:
+        _index_html = render_template('index.html').encode()
+    return Response(_index_html, mimetype='text/html')
 
 @app.route('/analyze', methods=['POST'])
 def analyze_video():
     """Analyze uploaded video and return results."""
+    # Reject oversized uploads from the header before reading any of the body
+    content_length = request.content_length
+    if content_length and content_length > app.config['MAX_CONTENT_LENGTH']:
+        return ojsonify({'error': 'File too large. Maximum size is 100MB'}), 413
+    
     if 'video' not in request.files:
-        return jsonify({'error': 'No video file provided'}), 400
+        return ojsonify({'error': 'No video file provided'}), 400
     
     file = request.files['video']
     
     if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+        return ojsonify({'error': 'No file selected'}), 400
     
     if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Allowed: mp4, avi, mov, mkv, webm'}), 400
+        return ojsonify({'error': 'Invalid file type. Allowed: mp4, avi, mov, mkv, webm'}), 400
+    
+    if not allowed_mimetype(file.mimetype):
+        return ojsonify({'error': 'Invalid file type. Uploaded file is not a video'}), 400
     
     try:
-        # Save uploaded file
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Analyze the video
-        analyzer = FormAnalyzer()
-        analysis_results = analyzer.analyze_squat(filepath)
+        skip_persist = bool(request.headers.get('X-Skip-Persist'))
         
-        # Calculate overall rating
-        rating_calc = RatingCalculator()
-        final_results = rating_calc.calculate_overall_rating(analysis_results)
+        if skip_persist:
+            # Spool to a temporary file that is removed after analysis
+            fd, filepath = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+            out = os.fdopen(fd, 'wb', buffering=COPY_BUFFER_SIZE)
+        else:
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            out = open(filepath, 'wb', buffering=COPY_BUFFER_SIZE)
         
-        # Add video info and angle information
-        final_results['video_filename'] = filename
-        if 'video_angle' in analysis_results:
-            final_results['video_angle'] = analysis_results['video_angle']
-        if 'angle_warning' in analysis_results:
-            final_results['angle_warning'] = analysis_results['angle_warning']
-        # Add snapshots if available
-        if 'snapshots' in analysis_results:
-            final_results['snapshots'] = analysis_results['snapshots']
+        try:
+            # Stream uploaded file to disk in large chunks
+            with out:
+                shutil.copyfileobj(file.stream, out, length=COPY_BUFFER_SIZE)
+            
+            # Analyze the video and calculate the rating in a pool process
+            executor = _get_executor()
+            try:
+                final_results = executor.submit(_run_pipeline, filepath, filename).result()
+            except BrokenProcessPool:
+                # A pool process died (crashed or killed, e.g. out of memory), which
+                # breaks the whole pool; replace it and fail this request
+                _discard_executor(executor)
+                raise
+        finally:
+            if skip_persist:
+                os.remove(filepath)
         
         # Clean up uploaded file (optional - you might want to keep it)
         # os.remove(filepath)
         
-        return jsonify(final_results)
+        return ojsonify(final_results)
     
     except Exception as e:
-        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+        return ojsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
@@ -1,96 +1,220 @@
 import numpy as np
 import cv2
 import base64
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from typing import List, Dict, Optional, Tuple
-from pose_detector import PoseDetector
-from angle_normalizer import AngleNormalizer
+from pose_detector import KeypointView, PoseDetector
+from angle_normalizer import AngleNormalizer, KEYPOINT_INDEX
+
+# Threads per analyzer for snapshot rendering and encoding (one per snapshot)
+SNAPSHOT_WORKERS = 5
+
+# Snapshots wider than this are downscaled before the angle overlays are drawn
+SNAPSHOT_MAX_WIDTH = 800
+
+# Prefix of the base64 JPEG data URIs returned for snapshots
+_JPEG_DATA_URI_PREFIX = b'data:image/jpeg;base64,'
+
+# Snapshot keys and labels in the order the positions are computed
+_SNAPSHOT_POSITIONS = (
+    ('start', 'Start Position'),
+    ('mid_descent', 'Mid Descent'),
+    ('bottom', 'Bottom Position'),
+    ('mid_ascent', 'Mid Ascent'),
+    ('end', 'End Position'),
+)
+# Positions that only make sense after the bottom frame
+_SNAPSHOT_AFTER_BOTTOM = np.array([False, False, False, True, True])
+
+# Snapshot overlay font and colors (BGR)
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_BACK_COLOR = (255, 255, 0)
+_LEFT_KNEE_COLOR = (0, 255, 255)
+_RIGHT_KNEE_COLOR = (255, 0, 255)
+_LABEL_COLOR = (0, 255, 255)
+
+# Joint names used as keys in the per-frame keypoint dictionaries
+_LHIP, _RHIP, _LKNEE, _RKNEE, _LANKLE, _RANKLE, _LSHO, _RSHO = (
+    'left_hip', 'right_hip', 'left_knee', 'right_knee',
+    'left_ankle', 'right_ankle', 'left_shoulder', 'right_shoulder'
+)
+
+# Keypoint columns in the (F, K, 2) keypoint array
+_LEFT_SHOULDER = KEYPOINT_INDEX[_LSHO]
+_RIGHT_SHOULDER = KEYPOINT_INDEX[_RSHO]
+_LEFT_HIP = KEYPOINT_INDEX[_LHIP]
+_RIGHT_HIP = KEYPOINT_INDEX[_RHIP]
+_LEFT_KNEE = KEYPOINT_INDEX[_LKNEE]
+_RIGHT_KNEE = KEYPOINT_INDEX[_RKNEE]
+_LEFT_ANKLE = KEYPOINT_INDEX[_LANKLE]
+_RIGHT_ANKLE = KEYPOINT_INDEX[_RANKLE]
+_HIPS = [_LEFT_HIP, _RIGHT_HIP]
+_KNEES = [_LEFT_KNEE, _RIGHT_KNEE]
+_ANKLES = [_LEFT_ANKLE, _RIGHT_ANKLE]
+
+# Left/right columns of the shoulder, hip and knee pairs (midpoints in one operation)
+_LEFT_PAIRS = [_LEFT_SHOULDER, _LEFT_HIP, _LEFT_KNEE]
+_RIGHT_PAIRS = [_RIGHT_SHOULDER, _RIGHT_HIP, _RIGHT_KNEE]
+
+def _pair_mid(kp: np.ndarray, vis: np.ndarray, left, right) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mask-weighted mean of left/right joint pairs.
+    
+    A pair with both joints visible averages them, and a pair with one visible
+    joint takes that one, without branching on which sides were detected.
+    
+    Args:
+        kp: (K, 2) keypoint coordinates
+        vis: (K,) keypoint visibility mask
+        left: Left joint column (or list of columns)
+        right: Matching right joint column (or list of columns)
+        
+    Returns:
+        Tuple of (midpoint(s) (..., 2), found flag(s)); a midpoint is
+        meaningless where its flag is False
+    """
+    mask = vis[[left, right]]
+    count = mask.sum(axis=0, dtype=kp.dtype)  # Counted in the coordinate dtype so the mean doesn't upcast
+    total = np.where(mask[..., None], kp[[left, right]], 0).sum(axis=0)
+    return total / np.maximum(count, 1)[..., None], count > 0
 
 class FormAnalyzer:
-    """Analyzes squat form based on pose keypoints."""
+    """
+    Analyzes squat form based on pose keypoints.
+    
+    An analyzer is not thread-safe: its pose detector tracks the pose across
+    frames, so run one analyze_squat call at a time per instance (or one
+    analyzer per process, as analyze_squats does). Call close(), or use it as
+    a context manager, to stop its snapshot rendering threads.
+    """
+    
+    # Knee tracking: piecewise-linear score over the average knee-ankle deviation
+    KNEE_DEV_BREAKS = np.array([0.0, 0.05, 0.1, 0.15, 0.30])
+    KNEE_DEV_SCORES = np.array([100., 100., 80., 60., 0.])
+    KNEE_DEV_FEEDBACK = (
+        "Excellent knee tracking - knees stay aligned over toes",
+        "Good knee tracking with minor deviation ({pct:.1f}%)",
+        "Moderate knee tracking issues - knees deviate {pct:.1f}% from toes",
+        "Poor knee tracking - significant deviation ({pct:.1f}%) detected. Focus on keeping knees over toes.",
+    )
+    
+    # Back angle: tier 0 inside the ideal 15-30 degree range, one tier per 5 degrees outside it
+    BACK_ANGLE_LOW_BREAKS = np.array([5., 10., 15.])
+    BACK_ANGLE_HIGH_BREAKS = np.array([30., 35., 40.])
+    BACK_ANGLE_SCORES = (100.0, 85.0, 70.0)
+    BACK_ANGLE_FEEDBACK = (
+        "Excellent back angle ({angle:.1f}°) - maintains good posture",
+        "Good back angle ({angle:.1f}°) - slightly outside ideal range",
+        "Moderate back angle issue ({angle:.1f}°) - consider adjusting torso position",
+    )
+    
+    # Alignment: tier 0 inside the ideal 85-105 degree knee angle, one tier per 10 degrees outside it
+    ALIGNMENT_LOW_BREAKS = np.array([65., 75., 85.])
+    ALIGNMENT_HIGH_BREAKS = np.array([105., 115., 125.])
+    ALIGNMENT_SCORES = (100.0, 85.0, 70.0, 50.0)
+    ALIGNMENT_FEEDBACK = (
+        "{side} side: Excellent alignment",
+        "{side} side: Good alignment",
+        "{side} side: Moderate alignment issues",
+        "{side} side: Poor alignment (angle: {angle:.1f}°)",
+    )
     
     def __init__(self):
         self.pose_detector = PoseDetector()
         self.angle_normalizer = AngleNormalizer()
+        self._executor = ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS, thread_name_prefix='snapshots')
+    
+    def close(self):
+        """Shut down the snapshot rendering threads."""
+        self._executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
-    def analyze_squat(self, video_path: str, include_snapshots: bool = True) -> Dict:
+    def analyze_squat(self, video_path: str, include_snapshots: bool = True, frame_step: int = 1,
+                      target_fps: Optional[float] = None) -> Dict:
         """
         Analyze squat form from video.
         
         Args:
             video_path: Path to the input video file
             include_snapshots: If True, include snapshot frames with pose overlays
+            frame_step: Run pose detection on every Nth frame only; the frames
+                around the coarse bottom are then filled in to find the exact one
+            target_fps: Derive frame_step from the video's frame rate so pose
+                detection runs at about this rate (overrides frame_step)
             
         Returns:
             Dictionary containing analysis results with metrics and scores
         """
-        # Extract keypoints from video (with frames if snapshots requested)
-        if include_snapshots:
-            frames_keypoints, annotated_frames = self.pose_detector.process_video(video_path, return_frames=True)
-        else:
-            frames_keypoints = self.pose_detector.process_video(video_path)
-            annotated_frames = None
+        if frame_step < 1:
+            raise ValueError(f"frame_step must be at least 1, got {frame_step}")
+        
+        # Extract keypoint arrays and pose landmarks from the video
+        keypoints, pose_landmarks, frame_indices, bottom_frame_idx = self._extract_pose(
+            video_path, frame_step=frame_step, target_fps=target_fps
+        )
         
-        if len(frames_keypoints) == 0:
+        if len(keypoints) == 0:
             return {
                 'error': 'No frames detected in video',
                 'score': 0
             }
         
-        # Detect angle and normalize keypoints
-        normalized_keypoints = self.angle_normalizer.detect_and_normalize(frames_keypoints)
-        angle_info = self.angle_normalizer.get_angle_info()
-        
-        # Find the bottom of the squat (lowest hip position)
-        bottom_frame_idx = int(self._find_bottom_frame(normalized_keypoints))
-        
-        # Calculate metrics using normalized keypoints
-        knee_tracking_score, knee_tracking_feedback = self._analyze_knee_tracking(
-            normalized_keypoints, bottom_frame_idx
-        )
-        
-        back_angle_score, back_angle_feedback = self._analyze_back_angle(
-            normalized_keypoints, bottom_frame_idx
-        )
+        # With target_fps the stream picks the step from the video's frame rate;
+        # processed frames are one step apart
+        if target_fps:
+            frame_step = frame_indices[1] - frame_indices[0] if len(frame_indices) > 1 else 1
+        
+        # Refine a coarse bottom using the skipped frames on either side of it
+        coarse_bottom_frame = None
+        if frame_step > 1:
+            coarse_bottom_frame = frame_indices[bottom_frame_idx]
+            keypoints, bottom_frame_idx = self._refine_bottom_frame(
+                video_path, frame_step, keypoints, pose_landmarks, frame_indices, bottom_frame_idx
+            )
         
-        depth_score, depth_feedback = self._analyze_depth(
-            normalized_keypoints, bottom_frame_idx
-        )
+        # Detect angle and normalize keypoints into dense (F, K, 2) coordinates
+        # + (F, K) visibility shared by all metrics
+        coords, visible = self.angle_normalizer.detect_and_normalize(keypoints)
+        angle_info = self.angle_normalizer.get_angle_info()
         
-        alignment_score, alignment_feedback = self._analyze_alignment(
-            normalized_keypoints, bottom_frame_idx
-        )
+        # Calculate all metrics from the bottom frame in one pass
+        metrics = self._compute_bottom_metrics(coords[bottom_frame_idx], visible[bottom_frame_idx])
         
         result = {
-            'knee_tracking': {
-                'score': float(knee_tracking_score),
-                'feedback': knee_tracking_feedback
-            },
-            'back_angle': {
-                'score': float(back_angle_score),
-                'feedback': back_angle_feedback
-            },
-            'depth': {
-                'score': float(depth_score),
-                'feedback': depth_feedback
-            },
-            'alignment': {
-                'score': float(alignment_score),
-                'feedback': alignment_feedback
-            },
-            'bottom_frame_idx': int(bottom_frame_idx),
-            'total_frames': int(len(normalized_keypoints)),
-            # Add angle information
-            'video_angle': angle_info
+            name: {
+                'score': score,
+                'feedback': feedback
+            }
+            for name, (score, feedback) in metrics.items()
         }
-        
-        # Add warning if angle is not ideal
-        if angle_info.get('warning'):
-            result['angle_warning'] = angle_info['warning']
-        
-        # Generate snapshots if frames are available
-        if include_snapshots and annotated_frames:
+        result.update({
+            # Video frame numbers of the bottom and of the last processed frame
+            # (the video may end up to frame_step - 1 frames after it), and the
+            # number of frames that went through pose detection
+            'bottom_frame_idx': frame_indices[bottom_frame_idx],
+            'last_frame_idx': frame_indices[-1],
+            'processed_frames': len(coords),
+            # Add angle information, with a warning if the angle is not ideal
+            'video_angle': angle_info,
+            **({'angle_warning': angle_info['warning']} if angle_info['warning'] else {})
+        })
+        if coarse_bottom_frame is not None:
+            result['coarse_bottom_frame_idx'] = coarse_bottom_frame
+        
+        # Generate snapshots if landmarks are available
+        if include_snapshots and pose_landmarks:
             try:
-                snapshots = self._generate_snapshots(annotated_frames, bottom_frame_idx, normalized_keypoints)
+                snapshots = self._generate_snapshots(
+                    video_path, pose_landmarks, bottom_frame_idx, coords, visible, frame_indices
+                )
                 if snapshots:
                     result['snapshots'] = snapshots
             except Exception as e:
@@ -100,389 +224,414 @@ class FormAnalyzer:
         
         return result
     
-    def _generate_snapshots(self, annotated_frames: List, bottom_idx: int, keypoints: List[Dict]) -> Dict:
+    def _extract_pose(self, video_path: str, frame_step: int = 1,
+                      target_fps: Optional[float] = None) -> Tuple[KeypointView, List, List[int], int]:
         """
-        Generate snapshot frames at key points of the squat with angle annotations.
+        Extract pose keypoints and find the bottom of the squat.
+        
+        Frames come from PoseDetector.process_video_stream, which decodes ahead
+        on a reader thread while the model runs on this one. Only the landmarks
+        are kept and turned into keypoint arrays once the video ends; snapshots
+        decode the few frames they need again and draw them from the landmarks.
         
         Args:
-            annotated_frames: List of frames with pose overlays
-            bottom_idx: Index of the bottom frame
-            keypoints: List of keypoint dictionaries
+            video_path: Path to the input video file
+            frame_step: Only process every Nth frame of the video
+            target_fps: Process the video at about this frame rate (overrides frame_step)
             
         Returns:
-            Dictionary with base64-encoded snapshot images and angle data
+            Tuple of (keypoints of the processed frames, pose landmarks of each,
+            video frame number of each, index of the bottom frame)
         """
-        snapshots = {}
-        total_frames = len(annotated_frames)
-        
-        # Snapshot 1: Start position (first 10% of video or first frame)
-        start_idx = int(min(5, total_frames - 1))
-        if start_idx < len(annotated_frames):
-            frame_with_angles = self._add_angle_annotations(
-                annotated_frames[start_idx].copy(), 
-                keypoints[start_idx]
-            )
-            snapshots['start'] = {
-                'frame_idx': int(start_idx),
-                'image': self._frame_to_base64(frame_with_angles),
-                'label': 'Start Position',
-                'angles': self._get_frame_angles(keypoints[start_idx])
-            }
+        pose_landmarks = []
+        frame_indices = []
+        poses = self.pose_detector.process_video_stream(video_path, target_fps=target_fps, frame_step=frame_step)
+        for pose_frame in poses:
+            pose_landmarks.append(pose_frame.landmarks)
+            frame_indices.append(pose_frame.frame_idx)
+        
+        keypoints = KeypointView(*self.pose_detector.landmarks_to_arrays(pose_landmarks))
+        
+        # Bottom is the lowest hip position (higher y = lower on screen). Angle
+        # normalization only mirrors x, so raw keypoints give the same bottom.
+        hip_y = self._hip_heights(keypoints.coords, keypoints.visible)
+        if np.isnan(hip_y).all():
+            bottom_idx = len(keypoints) // 2  # No hips detected, default to middle frame
+        else:
+            bottom_idx = int(np.nanargmax(hip_y))
         
-        # Snapshot 2: Mid descent (25% of way to bottom)
-        mid_idx = int(start_idx + (bottom_idx - start_idx) // 4)
-        if 0 <= mid_idx < len(annotated_frames):
-            frame_with_angles = self._add_angle_annotations(
-                annotated_frames[mid_idx].copy(), 
-                keypoints[mid_idx]
-            )
-            snapshots['mid_descent'] = {
-                'frame_idx': int(mid_idx),
-                'image': self._frame_to_base64(frame_with_angles),
-                'label': 'Mid Descent',
-                'angles': self._get_frame_angles(keypoints[mid_idx])
-            }
+        return keypoints, pose_landmarks, frame_indices, bottom_idx
+    
+    def _refine_bottom_frame(self, video_path: str, frame_step: int, keypoints: KeypointView,
+                             pose_landmarks: List, frame_indices: List[int],
+                             coarse_idx: int) -> Tuple[KeypointView, int]:
+        """
+        Run pose on the frames skipped around a coarse bottom and pick the true bottom.
         
-        # Snapshot 3: Bottom position (most important)
-        bottom_idx_int = int(bottom_idx)
-        if 0 <= bottom_idx_int < len(annotated_frames):
-            bottom_frame = annotated_frames[bottom_idx_int].copy()
-            cv2.putText(bottom_frame, 'BOTTOM', (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-            frame_with_angles = self._add_angle_annotations(
-                bottom_frame, 
-                keypoints[bottom_idx_int]
-            )
-            snapshots['bottom'] = {
-                'frame_idx': int(bottom_idx_int),
-                'image': self._frame_to_base64(frame_with_angles),
-                'label': 'Bottom Position',
-                'angles': self._get_frame_angles(keypoints[bottom_idx_int])
-            }
+        The skipped frames on either side of the coarse bottom are merged into
+        the keypoints, and into pose_landmarks and frame_indices in place (in
+        video order).
         
-        # Snapshot 4: Mid ascent (75% of way back up)
-        end_idx = int(min(bottom_idx_int + (total_frames - bottom_idx_int) * 3 // 4, total_frames - 1))
-        if 0 <= end_idx < len(annotated_frames) and end_idx > bottom_idx_int:
-            frame_with_angles = self._add_angle_annotations(
-                annotated_frames[end_idx].copy(), 
-                keypoints[end_idx]
+        Args:
+            video_path: Path to the input video file
+            frame_step: Step used for the coarse pass
+            keypoints: Keypoints of the processed frames
+            pose_landmarks: Pose landmarks of the processed frames
+            frame_indices: Video frame number of each processed frame
+            coarse_idx: Index of the coarse bottom in the processed frames
+            
+        Returns:
+            Tuple of (merged keypoints, index of the refined bottom in them)
+        """
+        bottom = slice(coarse_idx, coarse_idx + 1)
+        bottom_y = self._hip_heights(keypoints.coords[bottom], keypoints.visible[bottom])[0]
+        if np.isnan(bottom_y):
+            return keypoints, coarse_idx  # No hips detected anywhere, nothing to refine
+        
+        coarse_frame = frame_indices[coarse_idx]
+        start = max(coarse_frame - frame_step + 1, 0)
+        stop = coarse_frame + frame_step
+        
+        # The window is contiguous, so it is tracked from a fresh pose state
+        before, after = [], []
+        for pose_frame in self.pose_detector.process_video_stream(video_path, start=start, stop=stop):
+            if pose_frame.frame_idx == coarse_frame:
+                continue
+            (before if pose_frame.frame_idx < coarse_frame else after).append(
+                (pose_frame.frame_idx, pose_frame.landmarks)
             )
-            snapshots['mid_ascent'] = {
-                'frame_idx': int(end_idx),
-                'image': self._frame_to_base64(frame_with_angles),
-                'label': 'Mid Ascent',
-                'angles': self._get_frame_angles(keypoints[end_idx])
-            }
+        window = before + [(coarse_frame, pose_landmarks[coarse_idx])] + after
+        window_indices = [idx for idx, _ in window]
+        window_landmarks = [landmarks for _, landmarks in window]
+        
+        # Splice the window into the processed frames in place of the coarse bottom
+        window_coords, window_visible = self.pose_detector.landmarks_to_arrays(window_landmarks)
+        frame_indices[bottom] = window_indices
+        pose_landmarks[bottom] = window_landmarks
+        keypoints = KeypointView(
+            np.concatenate((keypoints.coords[:coarse_idx], window_coords, keypoints.coords[coarse_idx + 1:])),
+            np.concatenate((keypoints.visible[:coarse_idx], window_visible, keypoints.visible[coarse_idx + 1:]))
+        )
         
-        # Snapshot 5: End position (last 10% of video or last frame)
-        end_idx = int(max(total_frames - 5, bottom_idx_int + 1))
-        if end_idx < len(annotated_frames):
-            frame_with_angles = self._add_angle_annotations(
-                annotated_frames[end_idx].copy(), 
-                keypoints[end_idx]
-            )
-            snapshots['end'] = {
-                'frame_idx': int(end_idx),
-                'image': self._frame_to_base64(frame_with_angles),
-                'label': 'End Position',
-                'angles': self._get_frame_angles(keypoints[end_idx])
-            }
+        # A skipped frame only replaces the coarse bottom if its hips are strictly lower
+        bottom_idx = coarse_idx + len(before)
+        window_y = self._hip_heights(window_coords, window_visible)
+        if np.nanmax(window_y) > bottom_y:
+            bottom_idx = coarse_idx + int(np.nanargmax(window_y))
+        
+        return keypoints, bottom_idx
+    
+    def _generate_snapshots(self, video_path: str, pose_landmarks: List, bottom_idx: int, coords: np.ndarray,
+                            visible: np.ndarray, frame_indices: Optional[List[int]] = None) -> Dict:
+        """
+        Generate snapshot frames at key points of the squat with angle annotations.
+        
+        Only the frames picked for snapshots are decoded again and drawn, so
+        an analysis holds at most a handful of full frames in memory.
+        
+        Args:
+            video_path: Path to the input video file
+            pose_landmarks: Pose landmarks of each processed frame (for the pose overlays)
+            bottom_idx: Index of the bottom frame
+            coords: (F, K, 2) keypoint coordinates
+            visible: (F, K) keypoint visibility mask
+            frame_indices: Video frame number of each entry (defaults to its position)
+            
+        Returns:
+            Dictionary with base64-encoded snapshot images and angle data
+        """
+        pending = []  # (key, frame_idx, label, banner) of each snapshot to render
+        total_frames = len(pose_landmarks)
+        if frame_indices is None:
+            frame_indices = range(total_frames)
+        
+        # Frame of each snapshot position, computed together
+        bottom_idx = int(bottom_idx)
+        start_idx = min(5, total_frames - 1)
+        indices = np.array([
+            start_idx,  # Start position (first frames of the video)
+            start_idx + (bottom_idx - start_idx) // 4,  # Mid descent (25% of way to bottom)
+            bottom_idx,  # Bottom position (most important)
+            min(bottom_idx + (total_frames - bottom_idx) * 3 // 4, total_frames - 1),  # Mid ascent (75% of way back up)
+            max(total_frames - 5, bottom_idx + 1),  # End position (last frames of the video)
+        ])
+        
+        # Skip positions outside the video, and ascent/end positions not after the bottom
+        keep = (indices >= 0) & (indices < total_frames) & (~_SNAPSHOT_AFTER_BOTTOM | (indices > bottom_idx))
+        
+        for (key, label), frame_idx, use in zip(_SNAPSHOT_POSITIONS, indices.tolist(), keep.tolist()):
+            if use:
+                banner = 'BOTTOM' if key == 'bottom' else None
+                pending.append((key, frame_idx, label, banner))
+        
+        # Decode just the snapshot frames, skipping any that can no longer be read
+        frames = self.pose_detector.read_frames(video_path, [frame_indices[job[1]] for job in pending])
+        pending = [job for job in pending if frame_indices[job[1]] in frames]
+        if not pending:
+            return {}
+        
+        # Frames of a video all have the same size, so the snapshot size and the
+        # pixel scale of the normalized keypoints are worked out once for all of them
+        height, width = next(iter(frames.values())).shape[:2]
+        size = self._snapshot_size(width, height)
+        scale = np.array(size, dtype=np.float32)
+        
+        # Snapshots draw into their decoded frame, so positions that landed on
+        # the same frame (short videos) each get their own copy
+        job_frames = []
+        used = set()
+        for job in pending:
+            frame_no = frame_indices[job[1]]
+            job_frames.append(frames[frame_no].copy() if frame_no in used else frames[frame_no])
+            used.add(frame_no)
+        
+        # Draw, annotate and encode the snapshots in parallel (cv2 releases the GIL)
+        rendered = self._executor.map(
+            lambda job, frame: self._make_snapshot(
+                frame, pose_landmarks[job[1]], coords, visible, job[1], job[2], size, scale, job[3]
+            ),
+            pending, job_frames
+        )
+        snapshots = {job[0]: snapshot for job, snapshot in zip(pending, rendered)}
+        
+        # Report video frame numbers when only some frames were processed
+        for snapshot in snapshots.values():
+            snapshot['frame_idx'] = frame_indices[snapshot['frame_idx']]
         
         return snapshots
     
-    def _get_frame_angles(self, keypoints: Dict) -> Dict:
-        """Calculate back angle and knee angles for a frame."""
+    def _make_snapshot(self, frame, landmarks, coords: np.ndarray, visible: np.ndarray, frame_idx: int,
+                       label: str, size: Tuple[int, int], scale: np.ndarray, banner: Optional[str] = None) -> Dict:
+        """
+        Draw the pose on a decoded frame (in place), annotate it and build its snapshot entry.
+        
+        size is the (width, height) of the snapshot image and scale the same
+        pair as a float32 array for scaling normalized keypoints to pixels.
+        """
+        frame = self.pose_detector.get_annotated_frame(frame, landmarks, copy=False)
+        
+        # Draw the angles on the downscaled frame so they only touch the pixels that get encoded
+        if frame.shape[1::-1] != size:
+            # Area interpolation averages the source pixels, avoiding aliasing when shrinking
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if banner:
+            cv2.putText(frame, banner, (10, 30), _FONT, 1, _LABEL_COLOR, 2)
+        
+        angles, points = self._get_frame_angles(coords[frame_idx], visible[frame_idx])
+        frame_with_angles = self._add_angle_annotations(frame, angles, points, scale)
+        return {
+            'frame_idx': frame_idx,
+            'image': self._frame_to_base64(frame_with_angles),
+            'label': label,
+            'angles': angles
+        }
+    
+    def _get_frame_angles(self, kp: np.ndarray, vis: np.ndarray) -> Tuple[Dict, Dict]:
+        """
+        Calculate back angle and knee angles for a frame.
+        
+        Args:
+            kp: (K, 2) keypoint coordinates of the frame
+            vis: (K,) keypoint visibility mask of the frame
+            
+        Returns:
+            Tuple of (angles, points). points holds the normalized joint
+            positions each available angle was measured from: 'back' maps to
+            (hip, shoulder) and 'left_knee'/'right_knee' to (hip, knee, ankle).
+        """
         angles = {
             'back_angle': None,
             'left_knee_angle': None,
             'right_knee_angle': None
         }
+        points = {}
         
-        # Calculate back angle
-        left_shoulder = keypoints.get('left_shoulder')
-        right_shoulder = keypoints.get('right_shoulder')
-        left_hip = keypoints.get('left_hip')
-        right_hip = keypoints.get('right_hip')
-        
-        if (left_shoulder or right_shoulder) and (left_hip or right_hip):
-            if left_shoulder and right_shoulder:
-                shoulder_x = (left_shoulder[0] + right_shoulder[0]) / 2
-                shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-            elif left_shoulder:
-                shoulder_x, shoulder_y = left_shoulder
-            else:
-                shoulder_x, shoulder_y = right_shoulder
-            
-            if left_hip and right_hip:
-                hip_x = (left_hip[0] + right_hip[0]) / 2
-                hip_y = (left_hip[1] + right_hip[1]) / 2
-            elif left_hip:
-                hip_x, hip_y = left_hip
-            else:
-                hip_x, hip_y = right_hip
-            
-            dx = shoulder_x - hip_x
-            dy = shoulder_y - hip_y
+        # Calculate back angle from the shoulder and hip centers
+        (shoulder, hip), (has_shoulder, has_hip) = _pair_mid(
+            kp, vis, [_LEFT_SHOULDER, _LEFT_HIP], [_RIGHT_SHOULDER, _RIGHT_HIP]
+        )
+        
+        if has_shoulder and has_hip:
+            dx, dy = shoulder - hip
             
             if abs(dy) > 0.01:
-                angle_rad = np.arctan2(abs(dx), abs(dy))
-                angles['back_angle'] = float(np.degrees(angle_rad))
+                angle_rad = math.atan2(abs(dx), abs(dy))
+                angles['back_angle'] = math.degrees(angle_rad)
+                points['back'] = (hip, shoulder)
         
         # Calculate knee angles
-        left_hip_kp = keypoints.get('left_hip')
-        left_knee_kp = keypoints.get('left_knee')
-        left_ankle_kp = keypoints.get('left_ankle')
-        
-        if left_hip_kp and left_knee_kp and left_ankle_kp:
-            knee_angle = self._calculate_angle(left_hip_kp, left_knee_kp, left_ankle_kp)
+        if vis[_LEFT_HIP] and vis[_LEFT_KNEE] and vis[_LEFT_ANKLE]:
+            left_leg = kp[[_LEFT_HIP, _LEFT_KNEE, _LEFT_ANKLE]]
+            knee_angle = self._calculate_angle(*left_leg)
             if knee_angle is not None:
                 angles['left_knee_angle'] = float(knee_angle)
+                points['left_knee'] = left_leg
         
-        right_hip_kp = keypoints.get('right_hip')
-        right_knee_kp = keypoints.get('right_knee')
-        right_ankle_kp = keypoints.get('right_ankle')
-        
-        if right_hip_kp and right_knee_kp and right_ankle_kp:
-            knee_angle = self._calculate_angle(right_hip_kp, right_knee_kp, right_ankle_kp)
+        if vis[_RIGHT_HIP] and vis[_RIGHT_KNEE] and vis[_RIGHT_ANKLE]:
+            right_leg = kp[[_RIGHT_HIP, _RIGHT_KNEE, _RIGHT_ANKLE]]
+            knee_angle = self._calculate_angle(*right_leg)
             if knee_angle is not None:
                 angles['right_knee_angle'] = float(knee_angle)
+                points['right_knee'] = right_leg
         
-        return angles
+        return angles, points
     
-    def _add_angle_annotations(self, frame, keypoints: Dict) -> np.ndarray:
-        """Add angle annotations (text and lines) to a frame."""
-        height, width = frame.shape[:2]
+    def _add_angle_annotations(self, frame, angles: Dict, points: Dict,
+                               scale: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Add angle annotations (text and lines) to a frame from _get_frame_angles output.
+        
+        scale is the frame's (width, height) as a float32 array; pass it when
+        annotating several frames of one video to skip recomputing it.
+        """
+        if not points:
+            return frame
         
-        # Get angles
-        angles = self._get_frame_angles(keypoints)
+        if scale is None:
+            scale = np.array(frame.shape[1::-1], dtype=np.float32)
+        
+        # Scale every normalized point to pixels in one operation
+        flat = np.array([point for segment in points.values() for point in segment], dtype=np.float32)
+        pixels = iter(map(tuple, (flat * scale).astype(np.int32).tolist()))
+        pixel_points = {name: [next(pixels) for _ in segment] for name, segment in points.items()}
         
         # Draw back angle
-        if angles['back_angle'] is not None:
-            left_shoulder = keypoints.get('left_shoulder')
-            right_shoulder = keypoints.get('right_shoulder')
-            left_hip = keypoints.get('left_hip')
-            right_hip = keypoints.get('right_hip')
+        if 'back' in pixel_points:
+            (hip_x, hip_y), (shoulder_x, shoulder_y) = pixel_points['back']
+            
+            # Draw line from hip to shoulder
+            cv2.line(frame, (hip_x, hip_y), (shoulder_x, shoulder_y), _BACK_COLOR, 3)
             
-            if (left_shoulder or right_shoulder) and (left_hip or right_hip):
-                if left_shoulder and right_shoulder:
-                    shoulder_x = int((left_shoulder[0] + right_shoulder[0]) / 2 * width)
-                    shoulder_y = int((left_shoulder[1] + right_shoulder[1]) / 2 * height)
-                elif left_shoulder:
-                    shoulder_x = int(left_shoulder[0] * width)
-                    shoulder_y = int(left_shoulder[1] * height)
-                else:
-                    shoulder_x = int(right_shoulder[0] * width)
-                    shoulder_y = int(right_shoulder[1] * height)
-                
-                if left_hip and right_hip:
-                    hip_x = int((left_hip[0] + right_hip[0]) / 2 * width)
-                    hip_y = int((left_hip[1] + right_hip[1]) / 2 * height)
-                elif left_hip:
-                    hip_x = int(left_hip[0] * width)
-                    hip_y = int(left_hip[1] * height)
-                else:
-                    hip_x = int(right_hip[0] * width)
-                    hip_y = int(right_hip[1] * height)
-                
-                # Draw line from hip to shoulder
-                cv2.line(frame, (hip_x, hip_y), (shoulder_x, shoulder_y), (255, 255, 0), 3)
-                
-                # Draw angle text
-                text_x = (hip_x + shoulder_x) // 2
-                text_y = (hip_y + shoulder_y) // 2 - 10
-                cv2.putText(frame, f"Back: {angles['back_angle']:.1f}°", 
-                           (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+            # Draw angle text
+            text_x = (hip_x + shoulder_x) // 2
+            text_y = (hip_y + shoulder_y) // 2 - 10
+            cv2.putText(frame, f"Back: {angles['back_angle']:.1f}°", (text_x, text_y), _FONT, 0.7, _BACK_COLOR, 2)
         
         # Draw knee angles
-        if angles['left_knee_angle'] is not None:
-            left_hip_kp = keypoints.get('left_hip')
-            left_knee_kp = keypoints.get('left_knee')
-            left_ankle_kp = keypoints.get('left_ankle')
+        if 'left_knee' in pixel_points:
+            hip_pt, knee_pt, ankle_pt = pixel_points['left_knee']
+            
+            # Draw lines
+            cv2.line(frame, hip_pt, knee_pt, _LEFT_KNEE_COLOR, 2)
+            cv2.line(frame, knee_pt, ankle_pt, _LEFT_KNEE_COLOR, 2)
+            
+            # Draw angle text near knee
+            text_x = knee_pt[0] + 20
+            text_y = knee_pt[1] - 10
+            cv2.putText(frame, f"L Knee: {angles['left_knee_angle']:.1f}°", (text_x, text_y), _FONT, 0.6, _LEFT_KNEE_COLOR, 2)
+        
+        if 'right_knee' in pixel_points:
+            hip_pt, knee_pt, ankle_pt = pixel_points['right_knee']
             
-            if left_hip_kp and left_knee_kp and left_ankle_kp:
-                hip_pt = (int(left_hip_kp[0] * width), int(left_hip_kp[1] * height))
-                knee_pt = (int(left_knee_kp[0] * width), int(left_knee_kp[1] * height))
-                ankle_pt = (int(left_ankle_kp[0] * width), int(left_ankle_kp[1] * height))
-                
-                # Draw lines
-                cv2.line(frame, hip_pt, knee_pt, (0, 255, 255), 2)
-                cv2.line(frame, knee_pt, ankle_pt, (0, 255, 255), 2)
-                
-                # Draw angle text near knee
-                text_x = knee_pt[0] + 20
-                text_y = knee_pt[1] - 10
-                cv2.putText(frame, f"L Knee: {angles['left_knee_angle']:.1f}°", 
-                           (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-        
-        if angles['right_knee_angle'] is not None:
-            right_hip_kp = keypoints.get('right_hip')
-            right_knee_kp = keypoints.get('right_knee')
-            right_ankle_kp = keypoints.get('right_ankle')
+            # Draw lines
+            cv2.line(frame, hip_pt, knee_pt, _RIGHT_KNEE_COLOR, 2)
+            cv2.line(frame, knee_pt, ankle_pt, _RIGHT_KNEE_COLOR, 2)
             
-            if right_hip_kp and right_knee_kp and right_ankle_kp:
-                hip_pt = (int(right_hip_kp[0] * width), int(right_hip_kp[1] * height))
-                knee_pt = (int(right_knee_kp[0] * width), int(right_knee_kp[1] * height))
-                ankle_pt = (int(right_ankle_kp[0] * width), int(right_ankle_kp[1] * height))
-                
-                # Draw lines
-                cv2.line(frame, hip_pt, knee_pt, (255, 0, 255), 2)
-                cv2.line(frame, knee_pt, ankle_pt, (255, 0, 255), 2)
-                
-                # Draw angle text near knee
-                text_x = knee_pt[0] - 100
-                text_y = knee_pt[1] - 10
-                cv2.putText(frame, f"R Knee: {angles['right_knee_angle']:.1f}°", 
-                           (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
+            # Draw angle text near knee
+            text_x = knee_pt[0] - 100
+            text_y = knee_pt[1] - 10
+            cv2.putText(frame, f"R Knee: {angles['right_knee_angle']:.1f}°", (text_x, text_y), _FONT, 0.6, _RIGHT_KNEE_COLOR, 2)
         
         return frame
     
+    def _snapshot_size(self, width: int, height: int) -> Tuple[int, int]:
+        """(width, height) of the snapshot of a frame: at most SNAPSHOT_MAX_WIDTH wide, same aspect ratio."""
+        if width > SNAPSHOT_MAX_WIDTH:
+            return SNAPSHOT_MAX_WIDTH, int(height * SNAPSHOT_MAX_WIDTH / width)
+        return width, height
+    
     def _frame_to_base64(self, frame) -> str:
         """Convert a frame (numpy array) to base64-encoded JPEG string."""
-        # Resize frame if too large (max width 800px)
-        height, width = frame.shape[:2]
-        if width > 800:
-            scale = 800 / width
-            new_width = 800
-            new_height = int(height * scale)
-            frame = cv2.resize(frame, (new_width, new_height))
-        
         # Encode frame as JPEG
         _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        frame_base64 = base64.b64encode(buffer).decode('utf-8')
-        return f"data:image/jpeg;base64,{frame_base64}"
+        # Base64 output is pure ASCII, so build the data URI as bytes and decode once
+        return (_JPEG_DATA_URI_PREFIX + base64.b64encode(buffer)).decode('ascii')
     
-    def _find_bottom_frame(self, frames_keypoints: List[Dict]) -> int:
+    def _hip_heights(self, coords: np.ndarray, visible: np.ndarray) -> np.ndarray:
+        """(F,) average y of the visible hips in each frame, NaN where neither is visible."""
+        hips_visible = visible[:, _HIPS]
+        with np.errstate(invalid='ignore'):
+            return np.where(hips_visible, coords[:, _HIPS, 1], 0).sum(axis=1) / hips_visible.sum(axis=1)
+    
+    def _compute_bottom_metrics(self, kp: np.ndarray, vis: np.ndarray) -> Dict[str, Tuple[float, str]]:
         """
-        Find the frame where the squat is at its lowest point.
+        Compute all form metrics from the bottom-of-squat keypoints.
+        
+        Shared joint positions are extracted once and each metric is then
+        scored from the resulting scalars.
         
         Args:
-            frames_keypoints: List of keypoint dictionaries for each frame
+            kp: (K, 2) keypoint coordinates of the bottom frame
+            vis: (K,) keypoint visibility mask of the bottom frame
             
         Returns:
-            Index of the frame with lowest hip position
+            Dictionary mapping metric name to (score 0-100, feedback message)
         """
-        hip_heights = []
-        
-        for frame_kp in frames_keypoints:
-            left_hip = frame_kp.get('left_hip')
-            right_hip = frame_kp.get('right_hip')
-            
-            if left_hip and right_hip:
-                # Use y-coordinate (higher y = lower on screen)
-                avg_y = (left_hip[1] + right_hip[1]) / 2
-                hip_heights.append(avg_y)
-            elif left_hip:
-                hip_heights.append(left_hip[1])
-            elif right_hip:
-                hip_heights.append(right_hip[1])
-            else:
-                hip_heights.append(float('inf'))
+        mids, found = _pair_mid(kp, vis, _LEFT_PAIRS, _RIGHT_PAIRS)
+        shoulder, hip, knee = (mid if ok else None for mid, ok in zip(mids, found.tolist()))
+        
+        # Horizontal knee-ankle deviation, averaged over the sides with both joints visible
+        has_left = vis[_LEFT_KNEE] and vis[_LEFT_ANKLE]
+        has_right = vis[_RIGHT_KNEE] and vis[_RIGHT_ANKLE]
+        dev_left, dev_right = np.abs(kp[_KNEES, 0] - kp[_ANKLES, 0])
+        avg_deviation = (
+            (dev_left + dev_right) * 0.5 if has_left and has_right
+            else dev_left if has_left
+            else dev_right if has_right
+            else None
+        )
         
-        if not hip_heights or all(h == float('inf') for h in hip_heights):
-            return len(frames_keypoints) // 2  # Default to middle frame
+        # Knee angles of the legs with all three joints visible
+        angles, _ = self._get_frame_angles(kp, vis)
+        knee_angles = tuple(
+            math.nan if angle is None else angle
+            for angle in (angles['left_knee_angle'], angles['right_knee_angle'])
+        )
         
-        return np.argmax(hip_heights)  # Highest y = lowest position
+        return {
+            'knee_tracking': self._score_knee_tracking(avg_deviation),
+            'back_angle': self._score_back_angle(shoulder, hip),
+            'depth': self._score_depth(hip, knee),
+            'alignment': self._score_alignment(knee_angles),
+        }
     
-    def _analyze_knee_tracking(self, frames_keypoints: List[Dict], bottom_idx: int) -> Tuple[float, str]:
+    def _score_knee_tracking(self, avg_deviation: Optional[float]) -> Tuple[float, str]:
         """
-        Analyze if knees track over toes (lateral deviation).
+        Score if knees track over toes (lateral deviation).
         
         Args:
-            frames_keypoints: List of keypoint dictionaries
-            bottom_idx: Index of bottom frame
+            avg_deviation: Mean horizontal knee-ankle distance of the visible sides,
+                or None if neither side was detected
             
         Returns:
             Tuple of (score 0-100, feedback message)
         """
-        if bottom_idx >= len(frames_keypoints):
-            return 0.0, "Could not detect squat bottom position"
-        
-        bottom_frame = frames_keypoints[bottom_idx]
-        
-        # Get keypoints at bottom of squat
-        left_knee = bottom_frame.get('left_knee')
-        right_knee = bottom_frame.get('right_knee')
-        left_ankle = bottom_frame.get('left_ankle')
-        right_ankle = bottom_frame.get('right_ankle')
-        
-        if not (left_knee and left_ankle) and not (right_knee and right_ankle):
+        if avg_deviation is None:
             return 0.0, "Could not detect knee/ankle positions"
         
-        deviations = []
-        
-        # Analyze left side
-        if left_knee and left_ankle:
-            # Calculate horizontal deviation (knee x - ankle x)
-            knee_ankle_deviation = abs(left_knee[0] - left_ankle[0])
-            deviations.append(knee_ankle_deviation)
-        
-        # Analyze right side
-        if right_knee and right_ankle:
-            knee_ankle_deviation = abs(right_knee[0] - right_ankle[0])
-            deviations.append(knee_ankle_deviation)
-        
-        if not deviations:
-            return 0.0, "Could not calculate knee tracking"
-        
-        avg_deviation = np.mean(deviations)
-        
-        # Score: 0-0.05 deviation = 100, 0.05-0.1 = 80-100, 0.1-0.15 = 60-80, >0.15 = 0-60
-        if avg_deviation < 0.05:
-            score = 100.0
-            feedback = "Excellent knee tracking - knees stay aligned over toes"
-        elif avg_deviation < 0.1:
-            score = 100 - (avg_deviation - 0.05) * 400  # Linear from 100 to 80
-            feedback = f"Good knee tracking with minor deviation ({avg_deviation*100:.1f}%)"
-        elif avg_deviation < 0.15:
-            score = 80 - (avg_deviation - 0.1) * 400  # Linear from 80 to 60
-            feedback = f"Moderate knee tracking issues - knees deviate {avg_deviation*100:.1f}% from toes"
-        else:
-            score = max(0, 60 - (avg_deviation - 0.15) * 400)  # Linear from 60 to 0
-            feedback = f"Poor knee tracking - significant deviation ({avg_deviation*100:.1f}%) detected. Focus on keeping knees over toes."
+        # Score: 0-0.05 deviation = 100, 0.05-0.1 = 80-100, 0.1-0.15 = 60-80, 0.15-0.3 = 0-60
+        score = np.interp(avg_deviation, self.KNEE_DEV_BREAKS, self.KNEE_DEV_SCORES)
+        tier = int(np.searchsorted(self.KNEE_DEV_BREAKS[1:4], avg_deviation, side='right'))
+        feedback = self.KNEE_DEV_FEEDBACK[tier].format(pct=avg_deviation * 100)
         
-        return min(100, max(0, score)), feedback
+        return score, feedback
     
-    def _analyze_back_angle(self, frames_keypoints: List[Dict], bottom_idx: int) -> Tuple[float, str]:
+    def _score_back_angle(self, shoulder: Optional[np.ndarray], hip: Optional[np.ndarray]) -> Tuple[float, str]:
         """
-        Analyze back angle (torso angle relative to vertical).
+        Score back angle (torso angle relative to vertical).
         
         Args:
-            frames_keypoints: List of keypoint dictionaries
-            bottom_idx: Index of bottom frame
+            shoulder: Shoulder (x, y) position or None if not detected
+            hip: Hip (x, y) position or None if not detected
             
         Returns:
             Tuple of (score 0-100, feedback message)
         """
-        if bottom_idx >= len(frames_keypoints):
-            return 0.0, "Could not detect squat bottom position"
-        
-        bottom_frame = frames_keypoints[bottom_idx]
-        
-        # Get shoulder and hip positions
-        left_shoulder = bottom_frame.get('left_shoulder')
-        right_shoulder = bottom_frame.get('right_shoulder')
-        left_hip = bottom_frame.get('left_hip')
-        right_hip = bottom_frame.get('right_hip')
-        
-        if not (left_shoulder or right_shoulder) or not (left_hip or right_hip):
+        if shoulder is None or hip is None:
             return 0.0, "Could not detect shoulder/hip positions"
         
-        # Calculate average positions
-        if left_shoulder and right_shoulder:
-            shoulder_x = (left_shoulder[0] + right_shoulder[0]) / 2
-            shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-        elif left_shoulder:
-            shoulder_x, shoulder_y = left_shoulder
-        else:
-            shoulder_x, shoulder_y = right_shoulder
-        
-        if left_hip and right_hip:
-            hip_x = (left_hip[0] + right_hip[0]) / 2
-            hip_y = (left_hip[1] + right_hip[1]) / 2
-        elif left_hip:
-            hip_x, hip_y = left_hip
-        else:
-            hip_x, hip_y = right_hip
+        shoulder_x, shoulder_y = shoulder
+        hip_x, hip_y = hip
         
         # Calculate angle from vertical
         # Vector from hip to shoulder
@@ -493,20 +642,19 @@ class FormAnalyzer:
             return 50.0, "Could not calculate back angle accurately"
         
         # Angle from vertical (in radians, then convert to degrees)
-        angle_rad = np.arctan2(abs(dx), abs(dy))
-        angle_deg = np.degrees(angle_rad)
+        angle_rad = math.atan2(abs(dx), abs(dy))
+        angle_deg = math.degrees(angle_rad)
         
         # Ideal back angle is around 15-30 degrees from vertical
-        # Score based on how close to ideal range
-        if 15 <= angle_deg <= 30:
-            score = 100.0
-            feedback = f"Excellent back angle ({angle_deg:.1f}°) - maintains good posture"
-        elif 10 <= angle_deg < 15 or 30 < angle_deg <= 35:
-            score = 85.0
-            feedback = f"Good back angle ({angle_deg:.1f}°) - slightly outside ideal range"
-        elif 5 <= angle_deg < 10 or 35 < angle_deg <= 40:
-            score = 70.0
-            feedback = f"Moderate back angle issue ({angle_deg:.1f}°) - consider adjusting torso position"
+        # Tier by distance outside the ideal range (lower bounds inclusive below it, upper above it)
+        tier = max(
+            3 - int(np.searchsorted(self.BACK_ANGLE_LOW_BREAKS, angle_deg, side='right')),
+            int(np.searchsorted(self.BACK_ANGLE_HIGH_BREAKS, angle_deg, side='left'))
+        )
+        
+        if tier < 3:
+            score = self.BACK_ANGLE_SCORES[tier]
+            feedback = self.BACK_ANGLE_FEEDBACK[tier].format(angle=angle_deg)
         elif angle_deg < 5:
             score = 50.0
             feedback = f"Too upright ({angle_deg:.1f}°) - lean forward slightly to maintain balance"
@@ -516,45 +664,22 @@ class FormAnalyzer:
         
         return min(100, max(0, score)), feedback
     
-    def _analyze_depth(self, frames_keypoints: List[Dict], bottom_idx: int) -> Tuple[float, str]:
+    def _score_depth(self, hip: Optional[np.ndarray], knee: Optional[np.ndarray]) -> Tuple[float, str]:
         """
-        Analyze if hips go below knees at bottom of squat.
+        Score if hips go below knees at bottom of squat.
         
         Args:
-            frames_keypoints: List of keypoint dictionaries
-            bottom_idx: Index of bottom frame
+            hip: Hip (x, y) position or None if not detected
+            knee: Knee (x, y) position or None if not detected
             
         Returns:
             Tuple of (score 0-100, feedback message)
         """
-        if bottom_idx >= len(frames_keypoints):
-            return 0.0, "Could not detect squat bottom position"
-        
-        bottom_frame = frames_keypoints[bottom_idx]
-        
-        # Get hip and knee positions at bottom
-        left_hip = bottom_frame.get('left_hip')
-        right_hip = bottom_frame.get('right_hip')
-        left_knee = bottom_frame.get('left_knee')
-        right_knee = bottom_frame.get('right_knee')
-        
-        if not (left_hip or right_hip) or not (left_knee or right_knee):
+        if hip is None or knee is None:
             return 0.0, "Could not detect hip/knee positions"
         
-        # Calculate average positions
-        if left_hip and right_hip:
-            hip_y = (left_hip[1] + right_hip[1]) / 2
-        elif left_hip:
-            hip_y = left_hip[1]
-        else:
-            hip_y = right_hip[1]
-        
-        if left_knee and right_knee:
-            knee_y = (left_knee[1] + right_knee[1]) / 2
-        elif left_knee:
-            knee_y = left_knee[1]
-        else:
-            knee_y = right_knee[1]
+        hip_y = hip[1]
+        knee_y = knee[1]
         
         # Check if hip is below knee (higher y value = lower on screen)
         depth_achieved = hip_y > knee_y
@@ -588,75 +713,45 @@ class FormAnalyzer:
         
         return min(100, max(0, score)), feedback
     
-    def _analyze_alignment(self, frames_keypoints: List[Dict], bottom_idx: int) -> Tuple[float, str]:
+    def _score_alignment(self, knee_angles: Tuple[float, float]) -> Tuple[float, str]:
         """
-        Analyze hip-knee-ankle alignment.
+        Score hip-knee-ankle alignment.
         
         Args:
-            frames_keypoints: List of keypoint dictionaries
-            bottom_idx: Index of bottom frame
+            knee_angles: Left/right knee angles in degrees (NaN if not available)
             
         Returns:
             Tuple of (score 0-100, feedback message)
         """
-        if bottom_idx >= len(frames_keypoints):
-            return 0.0, "Could not detect squat bottom position"
-        
-        bottom_frame = frames_keypoints[bottom_idx]
-        
-        # Get keypoints
-        left_hip = bottom_frame.get('left_hip')
-        right_hip = bottom_frame.get('right_hip')
-        left_knee = bottom_frame.get('left_knee')
-        right_knee = bottom_frame.get('right_knee')
-        left_ankle = bottom_frame.get('left_ankle')
-        right_ankle = bottom_frame.get('right_ankle')
-        
-        alignment_scores = []
-        feedbacks = []
-        
-        # Analyze left side alignment
-        if left_hip and left_knee and left_ankle:
-            # Calculate angle at knee (hip-knee-ankle)
-            angle = self._calculate_angle(left_hip, left_knee, left_ankle)
-            if angle is not None:
-                # Ideal angle is around 90-100 degrees at bottom of squat
-                if 85 <= angle <= 105:
-                    alignment_scores.append(100.0)
-                    feedbacks.append("Left side: Excellent alignment")
-                elif 75 <= angle < 85 or 105 < angle <= 115:
-                    alignment_scores.append(85.0)
-                    feedbacks.append("Left side: Good alignment")
-                elif 65 <= angle < 75 or 115 < angle <= 125:
-                    alignment_scores.append(70.0)
-                    feedbacks.append("Left side: Moderate alignment issues")
-                else:
-                    alignment_scores.append(50.0)
-                    feedbacks.append(f"Left side: Poor alignment (angle: {angle:.1f}°)")
-        
-        # Analyze right side alignment
-        if right_hip and right_knee and right_ankle:
-            angle = self._calculate_angle(right_hip, right_knee, right_ankle)
-            if angle is not None:
-                if 85 <= angle <= 105:
-                    alignment_scores.append(100.0)
-                    feedbacks.append("Right side: Excellent alignment")
-                elif 75 <= angle < 85 or 105 < angle <= 115:
-                    alignment_scores.append(85.0)
-                    feedbacks.append("Right side: Good alignment")
-                elif 65 <= angle < 75 or 115 < angle <= 125:
-                    alignment_scores.append(70.0)
-                    feedbacks.append("Right side: Moderate alignment issues")
-                else:
-                    alignment_scores.append(50.0)
-                    feedbacks.append(f"Right side: Poor alignment (angle: {angle:.1f}°)")
-        
-        if not alignment_scores:
+        left_angle, right_angle = (float(angle) for angle in knee_angles)
+        angles = np.array((left_angle, right_angle))
+        
+        # Ideal angle is around 90-100 degrees at bottom of squat; tier both sides at once
+        left_tier, right_tier = np.maximum(
+            3 - np.searchsorted(self.ALIGNMENT_LOW_BREAKS, angles, side='right'),
+            np.searchsorted(self.ALIGNMENT_HIGH_BREAKS, angles, side='left')
+        ).tolist()
+        
+        scores = self.ALIGNMENT_SCORES
+        feedbacks = self.ALIGNMENT_FEEDBACK
+        has_left = not math.isnan(left_angle)
+        has_right = not math.isnan(right_angle)
+        
+        if has_left and has_right:
+            avg_score = (scores[left_tier] + scores[right_tier]) * 0.5
+            combined_feedback = " | ".join((
+                feedbacks[left_tier].format(side='Left', angle=left_angle),
+                feedbacks[right_tier].format(side='Right', angle=right_angle)
+            ))
+        elif has_left:
+            avg_score = float(scores[left_tier])
+            combined_feedback = feedbacks[left_tier].format(side='Left', angle=left_angle)
+        elif has_right:
+            avg_score = float(scores[right_tier])
+            combined_feedback = feedbacks[right_tier].format(side='Right', angle=right_angle)
+        else:
             return 0.0, "Could not calculate alignment"
         
-        avg_score = np.mean(alignment_scores)
-        combined_feedback = " | ".join(feedbacks)
-        
         return avg_score, combined_feedback
     
     def _calculate_angle(self, point1: Tuple[float, float], 
@@ -671,27 +766,49 @@ class FormAnalyzer:
             point2: Second point
             
         Returns:
-            Angle in degrees or None if calculation fails
+            Angle in degrees or None if either vector has zero length
         """
-        try:
-            # Vectors from vertex to points
-            vec1 = np.array([point1[0] - vertex[0], point1[1] - vertex[1]])
-            vec2 = np.array([point2[0] - vertex[0], point2[1] - vertex[1]])
-            
-            # Calculate angle using dot product
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-            
-            if norm1 == 0 or norm2 == 0:
-                return None
-            
-            cos_angle = dot_product / (norm1 * norm2)
-            cos_angle = np.clip(cos_angle, -1.0, 1.0)  # Avoid numerical errors
-            angle_rad = np.arccos(cos_angle)
-            angle_deg = np.degrees(angle_rad)
-            
-            return angle_deg
-        except:
+        # Vectors from vertex to points
+        ax, ay = point1[0] - vertex[0], point1[1] - vertex[1]
+        bx, by = point2[0] - vertex[0], point2[1] - vertex[1]
+        
+        # Calculate angle using dot product
+        norm1 = math.hypot(ax, ay)
+        norm2 = math.hypot(bx, by)
+        
+        if norm1 == 0 or norm2 == 0:
             return None
+        
+        cos_angle = (ax * bx + ay * by) / (norm1 * norm2)
+        cos_angle = max(-1.0, min(1.0, cos_angle))  # Avoid numerical errors
+        return math.degrees(math.acos(cos_angle))
+
 
+# Analyzer for the current analyze_squats pool process, built once by its initializer
+_worker_analyzer = None
+
+def _init_analyzer_worker():
+    """Create the per-process analyzer (loads the pose model once per worker)."""
+    global _worker_analyzer
+    _worker_analyzer = FormAnalyzer()
+
+def _analyze_in_worker(video_path: str, include_snapshots: bool) -> Dict:
+    """Analyze one video with the per-process analyzer (runs in a pool process)."""
+    return _worker_analyzer.analyze_squat(video_path, include_snapshots=include_snapshots)
+
+def analyze_squats(video_paths: List[str], workers: Optional[int] = None,
+                   include_snapshots: bool = True) -> List[Dict]:
+    """
+    Analyze several videos in parallel, one video per worker process.
+    
+    Args:
+        video_paths: Paths to the input video files
+        workers: Number of worker processes (defaults to the CPU count)
+        include_snapshots: If True, include snapshot frames with pose overlays
+        
+    Returns:
+        List of analysis results in the same order as video_paths
+    """
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_analyzer_worker) as executor:
+        return list(executor.map(_analyze_in_worker, video_paths, repeat(include_snapshots)))
@@ -0,0 +1,53 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to NumPy
+    NUMBA_AVAILABLE = False
+
+def _average_keypoints_numpy(coords: np.ndarray, visible: np.ndarray) -> np.ndarray:
+    """NumPy implementation of the keypoint averaging kernel."""
+    count = visible.sum(axis=0)
+    total = np.where(visible[:, :, None], coords, 0).sum(axis=0, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (total / count[:, None]).astype(np.float32)
+
+if NUMBA_AVAILABLE:
+    # No fastmath: missing joints are NaN
+    @njit(cache=True, nogil=True)
+    def _average_keypoints_numba(coords, visible):
+        """Single-pass compiled version of _average_keypoints_numpy."""
+        num_keypoints = coords.shape[1]
+        total = np.zeros((num_keypoints, 2), dtype=np.float64)
+        count = np.zeros(num_keypoints, dtype=np.int64)
+        for f in range(coords.shape[0]):
+            for k in range(num_keypoints):
+                if visible[f, k]:
+                    total[k, 0] += coords[f, k, 0]
+                    total[k, 1] += coords[f, k, 1]
+                    count[k] += 1
+        
+        average = np.full((num_keypoints, 2), np.nan, dtype=np.float32)
+        for k in range(num_keypoints):
+            if count[k] > 0:
+                average[k, 0] = total[k, 0] / count[k]
+                average[k, 1] = total[k, 1] / count[k]
+        return average
+    
+    _average_keypoints = _average_keypoints_numba
+else:
+    _average_keypoints = _average_keypoints_numpy
+
+def average_keypoints(coords: np.ndarray, visible: np.ndarray) -> np.ndarray:
+    """
+    Average the position of every keypoint over the frames it is visible in.
+    
+    Args:
+        coords: (F, K, 2) keypoint coordinates
+        visible: (F, K) keypoint visibility mask
+    
+    Returns:
+        (K, 2) float32 average positions, NaN for keypoints never visible
+    """
+    return _average_keypoints(coords, visible)
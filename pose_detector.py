@@ -1,88 +1,650 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Dict, NamedTuple, Sequence, Tuple, Optional
+from angle_normalizer import KEYPOINT_NAMES, KEYPOINT_INDEX, array_to_keypoints, keypoints_to_array
+from form_kernels import average_keypoints
+
+# Max frames buffered between the decode, inference and collect stages of process_video
+PREFETCH_FRAMES = 8
+
+# Upper bound on the result slots process_video preallocates from the container's
+# frame count, which can be far off for variable frame rate or streamed files
+MAX_PREALLOCATED_FRAMES = 1 << 16
+
+# End-of-video marker passed between process_video stages
+_END_OF_STREAM = object()
+
+# Pose Landmarker model bundle (.task) for the MediaPipe Tasks backend; when
+# unset the legacy mp.solutions.pose model is used
+POSE_MODEL_ENV = 'SQUATFORM_POSE_MODEL'
+
+# Legacy BlazePose model variant: 0 = Lite (about twice as fast on CPU, plenty
+# for the 13 body joints the analysis uses), 1 = Full, 2 = Heavy
+MODEL_COMPLEXITY_ENV = 'SQUATFORM_MODEL_COMPLEXITY'
+DEFAULT_MODEL_COMPLEXITY = 0
+
+# Tracking confidence needed to keep following the pose instead of re-detecting it
+MIN_TRACKING_CONFIDENCE = 0.7
+
+# Prebuilt TensorRT engine of the pose landmark network for the tensorrt backend
+TENSORRT_ENGINE_ENV = 'SQUATFORM_TENSORRT_ENGINE'
+
+# Motion gating in process_video(skip_static=True): frames are compared as
+# small grayscale thumbnails, the still-frame threshold is learned from the
+# first frames of each video and at most this many frames in a row reuse the
+# previous pose
+_MOTION_THUMBNAIL_SIZE = (64, 64)
+MOTION_CALIBRATION_FRAMES = 30
+MAX_REUSED_POSES = 4
+
+# Timestamp spacing fed to the Tasks landmarker in video mode when the frame
+# time isn't known: frames passed to detect_pose, videos without a frame rate (~30 fps)
+_FRAME_INTERVAL_MS = 33
+
+# MediaPipe pose landmark index of each keypoint, in KEYPOINT_NAMES order
+_LANDMARK_INDEX = (0, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28)
+_NUM_POSE_LANDMARKS = 33
+_KEYPOINT_LANDMARKS = tuple(zip(KEYPOINT_NAMES, _LANDMARK_INDEX))
+
+# Pose overlay style (BGR), matching MediaPipe's draw_landmarks with the specs we used to pass it
+_LANDMARK_COLOR = (0, 255, 0)
+_CONNECTION_COLOR = (0, 0, 255)
+_BORDER_COLOR = (224, 224, 224)
+_LANDMARK_RADIUS = 2
+_BORDER_RADIUS = 3
+_LINE_THICKNESS = 2
+
+# Keypoints of a frame without a detected pose (copied, never handed out)
+_EMPTY_KEYPOINTS = dict.fromkeys(KEYPOINT_NAMES)
+
+def open_video(video_path: str) -> cv2.VideoCapture:
+    """
+    Open a video for decoding, on the hardware decoder when one is available.
+    
+    FFmpeg picks whatever acceleration the platform has (NVDEC/CUDA, VA-API,
+    D3D11 or VideoToolbox) and OpenCV falls back to software decoding if
+    none of them can handle the stream.
+    
+    Args:
+        video_path: Path to the input video file
+        
+    Returns:
+        The opened capture (check isOpened() before reading)
+    """
+    acceleration = getattr(cv2, 'VIDEO_ACCELERATION_ANY', None)
+    if acceleration is not None:  # OpenCV 4.5.2+
+        try:
+            # No CAP_PROP_HW_DEVICE: FFmpeg rejects a device index with 'any' acceleration
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_HW_ACCELERATION, acceleration])
+            if cap.isOpened():
+                return cap
+            cap.release()
+        except cv2.error:
+            pass
+    
+    # Non-FFmpeg containers, or OpenCV builds without the hint
+    return cv2.VideoCapture(video_path)
+
+def _open_capture(video_path: str) -> cv2.VideoCapture:
+    """Open a video with open_video, raising ValueError if it can't be read."""
+    cap = open_video(video_path)
+    if not cap.isOpened():
+        cap.release()
+        raise ValueError(f"Could not open video file: {video_path}")
+    return cap
+
+def _read_capture(cap: cv2.VideoCapture, step: int = 1, start: int = 0,
+                  stop: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode frames from an opened capture.
+    
+    Args:
+        cap: Opened video capture, positioned at the first frame
+        step: Only decode every Nth frame (the others are skipped without decoding)
+        start: Frame number to start from
+        stop: Frame number to stop before (end of video if None)
+        
+    Yields:
+        Tuples of (frame number, BGR frame)
+    """
+    if start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    
+    idx = start
+    while cap.isOpened() and (stop is None or idx < stop):
+        if (idx - start) % step:
+            # Advance past frames we don't need without decoding them
+            if not cap.grab():
+                break
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield idx, frame
+        idx += 1
+
+def _frame_step(source_fps: float, target_fps: float) -> int:
+    """Frame step that downsamples source_fps to about target_fps (1 if source_fps is unknown or already lower)."""
+    if target_fps <= 0:
+        raise ValueError(f"target_fps must be positive, got {target_fps}")
+    if not source_fps > 0:
+        return 1  # Containers without a frame rate report 0 (or NaN)
+    return max(1, round(source_fps / target_fps))
+
+def _expected_frames(cap: cv2.VideoCapture, step: int) -> int:
+    """
+    Number of frames a capture will deliver at the given step, according to its container.
+    
+    Returns 0 when the container reports no usable count (0, negative or NaN);
+    large counts are capped at MAX_PREALLOCATED_FRAMES.
+    """
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    if not frame_count > 0:
+        return 0
+    return min(-(-int(frame_count) // step), MAX_PREALLOCATED_FRAMES)
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a pipeline queue, giving up (False) once the pipeline is shutting down."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Take an item off a pipeline queue, or _END_OF_STREAM once the pipeline is shutting down."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _END_OF_STREAM
+
+class StreamFrame(NamedTuple):
+    """One processed frame yielded by PoseDetector.process_video_stream."""
+    frame_idx: int  # Frame number in the video
+    keypoints: Dict[str, Optional[Tuple[float, float]]]  # Keypoint dictionary, see _extract_keypoints
+    landmarks: object  # Raw pose landmarks of the model (None if no pose), for get_annotated_frame
+    annotated_frame: Optional[np.ndarray]  # Frame with the pose overlay if requested, else None
+
+class KeypointView(Sequence):
+    """
+    Per-frame keypoint dictionaries backed by dense arrays.
+    
+    Indexing gives the same {name: (x, y) or None} dictionaries process_video
+    used to return, while coords and visible expose the whole video at once.
+    """
+    
+    def __init__(self, coords: np.ndarray, visible: np.ndarray):
+        self.coords = coords  # (F, K, 2) float32, NaN where not visible
+        self.visible = visible  # (F, K) bool
+    
+    def __len__(self) -> int:
+        return len(self.coords)
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return KeypointView(self.coords[idx], self.visible[idx])
+        return array_to_keypoints(self.coords[idx], self.visible[idx])
 
 class PoseDetector:
     """Detects human pose keypoints from video frames using MediaPipe."""
     
-    def __init__(self):
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            enable_segmentation=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+    def __init__(self, model_path: Optional[str] = None, use_gpu: bool = True,
+                 engine_path: Optional[str] = None, model_complexity: Optional[int] = None):
+        """
+        Load the pose model.
+        
+        Args:
+            model_path: Pose Landmarker .task bundle; selects the MediaPipe Tasks
+                backend (defaults to the SQUATFORM_POSE_MODEL environment variable,
+                the legacy solutions model is used if neither is set)
+            use_gpu: Run the Tasks model on the GPU delegate, falling back to the
+                CPU if the GPU can't be initialized
+            engine_path: TensorRT engine of the pose landmark network; selects the
+                tensorrt backend, which takes precedence over model_path (defaults
+                to the SQUATFORM_TENSORRT_ENGINE environment variable)
+            model_complexity: Legacy model variant, 0 (Lite) to 2 (Heavy); defaults to
+                the SQUATFORM_MODEL_COMPLEXITY environment variable, else Lite
+        """
+        self.model_path = model_path or os.environ.get(POSE_MODEL_ENV)
+        self.engine_path = engine_path or os.environ.get(TENSORRT_ENGINE_ENV)
+        self.use_gpu = use_gpu
+        if model_complexity is None:
+            model_complexity = int(os.environ.get(MODEL_COMPLEXITY_ENV, DEFAULT_MODEL_COMPLEXITY))
+        self.model_complexity = model_complexity
+        self.trt_model = None
+        self.landmarker = None
+        self.pose = None
+        self._rgb_buffer = None  # Reused RGB conversion target, sized on the first frame
+        
+        if self.engine_path:
+            from tensorrt_pose import TensorRTPoseModel
+            self.pose_connections = mp.tasks.vision.PoseLandmarksConnections.POSE_LANDMARKS
+            self.trt_model = TensorRTPoseModel(self.engine_path)
+        elif self.model_path:
+            self.pose_connections = mp.tasks.vision.PoseLandmarksConnections.POSE_LANDMARKS
+            self.landmarker = self._create_landmarker()
+        else:
+            self.mp_pose = mp.solutions.pose
+            self.pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=model_complexity,
+                enable_segmentation=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=MIN_TRACKING_CONFIDENCE
+            )
+            self.pose_connections = self.mp_pose.POSE_CONNECTIONS
+        
+        # (E, 2) landmark index pairs of the skeleton, for drawing it with one polylines call
+        # (legacy connections are tuples, Tasks connections have start/end)
+        self._connection_array = np.array(
+            [(c.start, c.end) if hasattr(c, 'start') else tuple(c) for c in self.pose_connections], dtype=np.intp
+        ).reshape(-1, 2)
     
-    def process_video(self, video_path: str, return_frames: bool = False) -> List[Dict[str, Optional[Tuple[float, float]]]]:
+    def _create_landmarker(self):
+        """Build a video-mode Pose Landmarker, on the GPU delegate when possible."""
+        vision = mp.tasks.vision
+        delegates = [mp.tasks.BaseOptions.Delegate.CPU]
+        if self.use_gpu:
+            delegates.insert(0, mp.tasks.BaseOptions.Delegate.GPU)
+        
+        for delegate in delegates:
+            options = vision.PoseLandmarkerOptions(
+                base_options=mp.tasks.BaseOptions(model_asset_path=self.model_path, delegate=delegate),
+                running_mode=vision.RunningMode.VIDEO,
+                min_pose_detection_confidence=0.5,
+                min_tracking_confidence=MIN_TRACKING_CONFIDENCE
+            )
+            try:
+                landmarker = vision.PoseLandmarker.create_from_options(options)
+            except RuntimeError:
+                if delegate == delegates[-1]:
+                    raise
+                continue  # No usable GPU, try the CPU
+            self._timestamp_ms = -1  # Timestamp of the last frame, the first one may be 0
+            self._landmarker_used = False
+            return landmarker
+    
+    def process_video(self, video_path: str, return_frames: bool = False,
+                      target_fps: Optional[float] = None, skip_static: bool = False) -> KeypointView:
         """
         Process video and extract pose keypoints for each frame.
         
         Args:
             video_path: Path to the input video file
             return_frames: If True, also return frames with pose overlays
+            target_fps: Downsample to about this frame rate before inference; the
+                skipped frames are grabbed without being decoded (all frames if None)
+            skip_static: Reuse the previous frame's pose instead of running the model
+                when the picture has barely changed since the last inference
+                (held lockout/bottom positions)
             
         Returns:
-            List of dictionaries containing keypoints for each frame.
-            Each dict has keys like 'left_hip', 'right_knee', etc.
-            Values are (x, y) tuples normalized to [0, 1] or None if not detected.
+            KeypointView of the keypoints of each processed frame. Indexing it gives a
+            dict with keys like 'left_hip', 'right_knee', etc. whose values are
+            (x, y) tuples normalized to [0, 1] or None if not detected; its
+            coords/visible arrays hold the same data for the whole video.
             If return_frames is True, also returns a list of annotated frames.
         """
-        cap = cv2.VideoCapture(video_path)
-        frames_data = []
-        annotated_frames = []
+        # Decoding, inference and keypoint extraction/drawing run as three
+        # stages connected by bounded queues: _pose_stream decodes ahead on a
+        # reader thread and runs the model on this thread (the Pose object is
+        # not thread-safe, so it is only ever used here) and a collector thread
+        # builds the results.
+        collect_queue = queue.Queue(maxsize=PREFETCH_FRAMES)
+        stop = threading.Event()
+        errors = []
         
-        if not cap.isOpened():
-            raise ValueError(f"Could not open video file: {video_path}")
+        cap = _open_capture(video_path)
+        step = _frame_step(cap.get(cv2.CAP_PROP_FPS), target_fps) if target_fps else 1
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        # Size the result lists from the container's frame count up front; the
+        # count is only a hint, so they still grow or get trimmed to what was read
+        expected = _expected_frames(cap, step)
+        frame_landmarks = [None] * expected  # Raw landmarks per frame, converted to arrays in one pass at the end
+        annotated_frames = [None] * expected if return_frames else []
+        num_frames = 0
+        
+        def collect():
+            nonlocal num_frames
+            try:
+                while True:
+                    item = _get(collect_queue, stop)
+                    if item is _END_OF_STREAM:
+                        return
+                    _, frame, landmarks = item
+                    annotated = None
+                    if return_frames:
+                        # Each decoded frame is only used here, so draw on it directly
+                        annotated = self.get_annotated_frame(frame, landmarks, copy=False)
+                    
+                    if num_frames < expected:
+                        frame_landmarks[num_frames] = landmarks
+                        if return_frames:
+                            annotated_frames[num_frames] = annotated
+                    else:
+                        frame_landmarks.append(landmarks)
+                        if return_frames:
+                            annotated_frames.append(annotated)
+                    num_frames += 1
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        poses = self._pose_stream(cap, step, skip_static=skip_static)
+        collector = threading.Thread(target=collect, daemon=True)
+        collector.start()
+        
+        try:
+            for item in poses:
+                if not _put(collect_queue, item, stop):
+                    break
             
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Process frame
-            results = self.pose.process(rgb_frame)
-            
-            # Extract keypoints
-            frame_keypoints = self._extract_keypoints(results.pose_landmarks)
-            frames_data.append(frame_keypoints)
-            
-            # If requested, draw pose on frame
-            if return_frames:
-                annotated_frame = frame.copy()
-                if results.pose_landmarks:
-                    self.mp_drawing.draw_landmarks(
-                        annotated_frame,
-                        results.pose_landmarks,
-                        self.mp_pose.POSE_CONNECTIONS,
-                        self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                        self.mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2)
-                    )
-                annotated_frames.append(annotated_frame)
+            # Let the collector drain what is still queued
+            _put(collect_queue, _END_OF_STREAM, stop)
+            collector.join()
+        finally:
+            stop.set()
+            poses.close()
+            collector.join()
+            cap.release()
         
-        cap.release()
+        if errors:
+            raise errors[0]
+        
+        # The decoder delivered fewer frames than the container advertised
+        del frame_landmarks[num_frames:]
+        del annotated_frames[num_frames:]
+        
+        frames_data = KeypointView(*self.landmarks_to_arrays(frame_landmarks))
         
         if return_frames:
             return frames_data, annotated_frames
         return frames_data
     
-    def get_annotated_frame(self, frame, landmarks):
-        """Get a single frame with pose landmarks drawn on it."""
-        annotated = frame.copy()
+    def process_video_stream(self, video_path: str, return_frames: bool = False,
+                             target_fps: Optional[float] = None, skip_static: bool = False,
+                             frame_step: int = 1, start: int = 0,
+                             stop: Optional[int] = None) -> Iterator[StreamFrame]:
+        """
+        Process video frame by frame, yielding each frame's pose as soon as it is found.
+        
+        Unlike process_video nothing is accumulated, so memory stays flat however
+        long the video is. Frames are decoded ahead on a reader thread while the
+        model runs on the consuming thread. Closing the generator early stops decoding.
+        
+        Args:
+            video_path: Path to the input video file
+            return_frames: If True, also yield the frame with the pose overlay
+            target_fps: Downsample to about this frame rate before inference (see
+                process_video); overrides frame_step
+            skip_static: Reuse poses for near-static frames (see process_video)
+            frame_step: Only process every Nth frame
+            start: Frame number to start from
+            stop: Frame number to stop before (end of video if None)
+            
+        Yields:
+            StreamFrame of each processed frame, in video order
+        """
+        cap = _open_capture(video_path)
+        try:
+            step = _frame_step(cap.get(cv2.CAP_PROP_FPS), target_fps) if target_fps else frame_step
+            poses = self._pose_stream(cap, step, start, stop, skip_static)
+            try:
+                for idx, frame, landmarks in poses:
+                    annotated_frame = self.get_annotated_frame(frame, landmarks, copy=False) if return_frames else None
+                    yield StreamFrame(idx, self._extract_keypoints(landmarks), landmarks, annotated_frame)
+            finally:
+                poses.close()
+        finally:
+            cap.release()
+    
+    def _pose_stream(self, cap: cv2.VideoCapture, step: int = 1, start: int = 0, stop: Optional[int] = None,
+                     skip_static: bool = False) -> Iterator[Tuple[int, np.ndarray, object]]:
+        """
+        Decode a video on a reader thread and run the pose model on each frame.
+        
+        This is the one decode -> pose pipeline; process_video and
+        process_video_stream (and through it FormAnalyzer) are built on it.
+        The caller opens the capture and releases it after closing the generator.
+        
+        Args:
+            cap: Opened video capture
+            step: Only process every Nth frame
+            start: Frame number to start from
+            stop: Frame number to stop before (end of video if None)
+            skip_static: Reuse poses for near-static frames (see process_video)
+            
+        Yields:
+            Tuples of (frame number, BGR frame, pose landmarks or None)
+        """
+        read_queue = queue.Queue(maxsize=PREFETCH_FRAMES)
+        stop_event = threading.Event()
+        
+        # Frame rate for the Tasks landmarker's video timestamps, which have to
+        # follow the frame numbers so skipped frames show up as elapsed time
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if not fps > 0:
+            fps = 1000 / _FRAME_INTERVAL_MS
+        
+        def read_frames():
+            frames = _read_capture(cap, step, start, stop)
+            try:
+                for item in frames:
+                    if not _put(read_queue, item, stop_event):
+                        return
+                _put(read_queue, _END_OF_STREAM, stop_event)
+            except Exception as e:
+                _put(read_queue, e, stop_event)
+            finally:
+                frames.close()
+        
+        self.reset()
+        reader = threading.Thread(target=read_frames, daemon=True)
+        reader.start()
+        
+        landmarks = None
+        reference = None  # Thumbnail of the last frame the model ran on
+        reused = 0
+        motions = []
+        threshold = None
+        
+        try:
+            while True:
+                item = _get(read_queue, stop_event)
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                
+                idx, frame = item
+                if skip_static:
+                    thumbnail = cv2.resize(
+                        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), _MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA
+                    )
+                    motion = cv2.absdiff(thumbnail, reference).mean() if reference is not None else None
+                    
+                    if threshold is None:
+                        # Learn what "still" looks like for this video (camera noise, compression)
+                        if motion is not None:
+                            motions.append(motion)
+                        if len(motions) >= MOTION_CALIBRATION_FRAMES:
+                            threshold = float(np.percentile(motions, 25))
+                    elif motion <= threshold and landmarks is not None and reused < MAX_REUSED_POSES:
+                        reused += 1
+                        yield idx, frame, landmarks
+                        continue
+                    
+                    reference = thumbnail
+                    reused = 0
+                
+                landmarks = self._infer(frame, round(idx * 1000 / fps))
+                yield idx, frame, landmarks
+        finally:
+            stop_event.set()
+            reader.join()
+    
+    def process_videos(self, video_paths: List[str], workers: Optional[int] = None,
+                       target_fps: Optional[float] = None, skip_static: bool = False) -> List[KeypointView]:
+        """
+        Extract pose keypoints from several videos in parallel, one video per worker process.
+        
+        Every worker loads its own model with this detector's settings, since
+        the MediaPipe graph can't be shared across processes.
+        
+        Args:
+            video_paths: Paths to the input video files
+            workers: Number of worker processes (defaults to the CPU count)
+            target_fps: Downsample each video to about this frame rate (see process_video)
+            skip_static: Reuse poses for near-static frames (see process_video)
+            
+        Returns:
+            List of KeypointViews in the same order as video_paths
+        """
+        settings = (self.model_path, self.use_gpu, self.engine_path, self.model_complexity)
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_detector_worker, initargs=settings) as executor:
+            return list(executor.map(_process_in_worker, video_paths, repeat(target_fps), repeat(skip_static)))
+    
+    def reset(self):
+        """Drop tracking state left over from a previously processed video."""
+        if self.trt_model is not None:
+            self.trt_model.reset()
+        elif self.landmarker is None:
+            self.pose.reset()
+        elif self._landmarker_used:
+            # The Tasks landmarker can't be reset, so start a fresh one
+            self.landmarker.close()
+            self.landmarker = self._create_landmarker()
+    
+    def _infer(self, frame: np.ndarray, timestamp_ms: Optional[int] = None):
+        """
+        Run the pose model on a BGR frame and return its pose landmarks (None if no pose).
+        
+        Args:
+            frame: BGR frame from the video
+            timestamp_ms: Time of the frame in the video, used by the Tasks landmarker
+                (defaults to _FRAME_INTERVAL_MS after the previous frame)
+        """
+        # Convert into the same buffer every frame instead of allocating a new one;
+        # the models only read it during the call
+        if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+            self._rgb_buffer = np.empty_like(frame)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        
+        if self.trt_model is not None:
+            return self.trt_model.infer(rgb_frame)
+        if self.landmarker is None:
+            return self.pose.process(rgb_frame).pose_landmarks
+        
+        # Video mode needs strictly increasing timestamps to track the pose between frames
+        if timestamp_ms is None:
+            timestamp_ms = self._timestamp_ms + _FRAME_INTERVAL_MS
+        self._timestamp_ms = max(timestamp_ms, self._timestamp_ms + 1)
+        self._landmarker_used = True
+        result = self.landmarker.detect_for_video(
+            mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame), self._timestamp_ms
+        )
+        return result.pose_landmarks[0] if result.pose_landmarks else None
+    
+    def read_frames(self, video_path: str, frame_numbers: Iterable[int]) -> Dict[int, np.ndarray]:
+        """
+        Decode only the given frames of a video.
+        
+        Args:
+            video_path: Path to the input video file
+            frame_numbers: Frame numbers to decode (any order, duplicates allowed)
+            
+        Returns:
+            Dictionary mapping each frame number that could be read to its BGR frame
+        """
+        wanted = sorted(set(frame_numbers))
+        frames = {}
+        if not wanted:
+            return frames
+        
+        cap = open_video(video_path)
+        
+        try:
+            if not cap.isOpened():
+                raise ValueError(f"Could not open video file: {video_path}")
+            
+            if wanted[0] > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, wanted[0])
+            
+            idx = wanted[0]
+            for target in wanted:
+                # Advance to the next wanted frame without decoding the ones in between
+                while idx < target:
+                    if not cap.grab():
+                        return frames
+                    idx += 1
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames[target] = frame
+                idx += 1
+        finally:
+            cap.release()
+        
+        return frames
+    
+    def detect_pose(self, frame: np.ndarray) -> Tuple[Dict[str, Optional[Tuple[float, float]]], object]:
+        """
+        Run the pose model on a single BGR frame without drawing anything.
+        
+        Args:
+            frame: BGR frame from the video
+            
+        Returns:
+            Tuple of (keypoints dictionary, MediaPipe pose landmarks or None),
+            the landmarks can be passed to get_annotated_frame later
+        """
+        landmarks = self._infer(frame)
+        return self._extract_keypoints(landmarks), landmarks
+    
+    def get_annotated_frame(self, frame, landmarks, copy: bool = True):
+        """
+        Get a single frame with pose landmarks drawn on it.
+        
+        Args:
+            frame: BGR frame
+            landmarks: Pose landmarks of the frame (None if no pose)
+            copy: Draw on a copy of the frame; pass False to draw into a frame
+                the caller owns and doesn't need unannotated any more
+            
+        Returns:
+            The annotated frame (frame itself when copy is False)
+        """
+        annotated = frame.copy() if copy else frame
         if landmarks:
-            self.mp_drawing.draw_landmarks(
-                annotated,
-                landmarks,
-                self.mp_pose.POSE_CONNECTIONS,
-                self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                self.mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2)
+            height, width = annotated.shape[:2]
+            points = np.array(
+                [(lm.x, lm.y, lm.visibility) for lm in getattr(landmarks, 'landmark', landmarks)], dtype=np.float64
             )
+            
+            # Like MediaPipe, only draw visible landmarks that fall inside the frame
+            xy = points[:, :2]
+            drawn = (points[:, 2] >= 0.5) & (xy >= 0).all(axis=1) & (xy <= 1).all(axis=1)
+            pixels = np.minimum(np.floor(xy * (width, height)), (width - 1, height - 1)).astype(np.int32)
+            
+            # All connections between drawn landmarks in one call, then the landmarks on top
+            edges = self._connection_array[drawn[self._connection_array].all(axis=1)]
+            if len(edges):
+                cv2.polylines(annotated, pixels[edges], False, _CONNECTION_COLOR, _LINE_THICKNESS)
+            for center in pixels[drawn].tolist():
+                center = tuple(center)
+                cv2.circle(annotated, center, _BORDER_RADIUS, _BORDER_COLOR, _LINE_THICKNESS)
+                cv2.circle(annotated, center, _LANDMARK_RADIUS, _LANDMARK_COLOR, _LINE_THICKNESS)
         return annotated
     
     def _extract_keypoints(self, landmarks) -> Dict[str, Optional[Tuple[float, float]]]:
@@ -90,7 +652,7 @@ class PoseDetector:
         Extract keypoints from MediaPipe landmarks.
         
         Args:
-            landmarks: MediaPipe pose landmarks
+            landmarks: MediaPipe pose landmarks (legacy landmark list or Tasks list of landmarks)
             
         Returns:
             Dictionary with keypoint names and (x, y) coordinates
@@ -98,26 +660,12 @@ class PoseDetector:
         if landmarks is None:
             return self._empty_keypoints()
         
-        # MediaPipe pose landmark indices
-        keypoint_map = {
-            'nose': 0,
-            'left_shoulder': 11,
-            'right_shoulder': 12,
-            'left_elbow': 13,
-            'right_elbow': 14,
-            'left_wrist': 15,
-            'right_wrist': 16,
-            'left_hip': 23,
-            'right_hip': 24,
-            'left_knee': 25,
-            'right_knee': 26,
-            'left_ankle': 27,
-            'right_ankle': 28,
-        }
+        # The legacy solution wraps its landmarks in a proto, the Tasks API returns a plain list
+        landmarks = getattr(landmarks, 'landmark', landmarks)
         
         keypoints = {}
-        for name, idx in keypoint_map.items():
-            landmark = landmarks.landmark[idx]
+        for name, idx in _KEYPOINT_LANDMARKS:
+            landmark = landmarks[idx]
             if landmark.visibility > 0.5:  # Only include visible keypoints
                 keypoints[name] = (landmark.x, landmark.y)
             else:
@@ -125,44 +673,87 @@ class PoseDetector:
         
         return keypoints
     
+    def landmarks_to_arrays(self, landmarks_list: List) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract keypoints from the MediaPipe landmarks of many frames as arrays.
+        
+        Args:
+            landmarks_list: Pose landmarks per frame (legacy landmark list, Tasks list
+                of landmarks, or None where no pose was found)
+            
+        Returns:
+            Tuple of ((F, K, 2) coordinates with NaN where not visible, (F, K) visibility mask)
+        """
+        # Copy (x, y, visibility) of every landmark once per frame; frames without
+        # a pose keep zero visibility
+        points = np.zeros((len(landmarks_list), _NUM_POSE_LANDMARKS, 3), dtype=np.float32)
+        for i, landmarks in enumerate(landmarks_list):
+            if landmarks is not None:
+                points[i] = [(lm.x, lm.y, lm.visibility) for lm in getattr(landmarks, 'landmark', landmarks)]
+        
+        # Gather the analyzed joints and mask the ones that aren't visible for the whole video at once
+        points = points[:, _LANDMARK_INDEX]
+        visible = points[:, :, 2] > 0.5  # Only include visible keypoints
+        coords = np.ascontiguousarray(points[:, :, :2])
+        coords[~visible] = np.nan
+        return coords, visible
+    
     def _empty_keypoints(self) -> Dict[str, Optional[Tuple[float, float]]]:
         """Return empty keypoints dictionary."""
-        return {
-            'nose': None,
-            'left_shoulder': None,
-            'right_shoulder': None,
-            'left_elbow': None,
-            'right_elbow': None,
-            'left_wrist': None,
-            'right_wrist': None,
-            'left_hip': None,
-            'right_hip': None,
-            'left_knee': None,
-            'right_knee': None,
-            'left_ankle': None,
-            'right_ankle': None,
-        }
+        return _EMPTY_KEYPOINTS.copy()
+    
+    def get_average_keypoints(self, keypoints_list: List[Dict]) -> np.ndarray:
+        """
+        Get the average position of every keypoint across multiple frames.
+        
+        Args:
+            keypoints_list: List of keypoint dictionaries (or a KeypointView)
+            
+        Returns:
+            (K, 2) array of average (x, y) positions in KEYPOINT_NAMES order,
+            NaN for keypoints not detected in any frame
+        """
+        if isinstance(keypoints_list, KeypointView):
+            return average_keypoints(keypoints_list.coords, keypoints_list.visible)
+        return average_keypoints(*keypoints_to_array(keypoints_list))
     
     def get_average_keypoint(self, keypoints_list: List[Dict], keypoint_name: str) -> Optional[Tuple[float, float]]:
         """
         Get average position of a keypoint across multiple frames.
         
         Args:
-            keypoints_list: List of keypoint dictionaries
+            keypoints_list: List of keypoint dictionaries (or a KeypointView)
             keypoint_name: Name of the keypoint to average
             
         Returns:
             Average (x, y) position or None if not detected in any frame
         """
-        valid_points = [
-            kp[keypoint_name] for kp in keypoints_list
-            if kp[keypoint_name] is not None
-        ]
+        if not isinstance(keypoints_list, KeypointView):
+            # Only one keypoint is needed, so read it straight into an array
+            # instead of converting every keypoint of every frame
+            valid_points = [kp[keypoint_name] for kp in keypoints_list if kp[keypoint_name] is not None]
+            if not valid_points:
+                return None
+            points = np.fromiter(
+                (value for point in valid_points for value in point), dtype=np.float64, count=2 * len(valid_points)
+            ).reshape(-1, 2)
+            avg_x, avg_y = points.mean(axis=0).tolist()
+            return (avg_x, avg_y)
         
-        if not valid_points:
+        avg_x, avg_y = self.get_average_keypoints(keypoints_list)[KEYPOINT_INDEX[keypoint_name]].tolist()
+        if np.isnan(avg_x):
             return None
-        
-        avg_x = np.mean([p[0] for p in valid_points])
-        avg_y = np.mean([p[1] for p in valid_points])
         return (avg_x, avg_y)
 
+# Detector for the current process_videos pool process, built once by its initializer
+_worker_detector = None
+
+def _init_detector_worker(model_path: Optional[str], use_gpu: bool, engine_path: Optional[str],
+                          model_complexity: int):
+    """Create the per-process detector (loads the pose model once per worker)."""
+    global _worker_detector
+    _worker_detector = PoseDetector(model_path, use_gpu, engine_path, model_complexity)
+
+def _process_in_worker(video_path: str, target_fps: Optional[float], skip_static: bool) -> KeypointView:
+    """Extract the keypoints of one video with the per-process detector (runs in a pool process)."""
+    return _worker_detector.process_video(video_path, target_fps=target_fps, skip_static=skip_static)
@@ -1,8 +1,16 @@
+import numpy as np
+from operator import itemgetter
 from typing import Dict
 
 class RatingCalculator:
     """Calculates overall squat form rating and generates feedback."""
     
+    # Letter rating for each 10-point band of the score (index 10 is a perfect 100)
+    _LETTER_RATINGS = 'FFFFFFDCBAA'
+    
+    # Scored metrics, in the order of the weight and score arrays
+    _METRICS = ('knee_tracking', 'back_angle', 'depth', 'alignment')
+    
     def __init__(self):
         # Weights for each metric (should sum to 1.0)
         self.weights = {
@@ -11,6 +19,7 @@ class RatingCalculator:
             'depth': 0.30,
             'alignment': 0.20
         }
+        self._weights = tuple(float(self.weights[name]) for name in self._METRICS)
     
     def calculate_overall_rating(self, analysis_results: Dict) -> Dict:
         """
@@ -29,22 +38,18 @@ class RatingCalculator:
                 'feedback': analysis_results['error']
             }
         
-        # Extract individual scores
-        knee_tracking_score = analysis_results['knee_tracking']['score']
-        back_angle_score = analysis_results['back_angle']['score']
-        depth_score = analysis_results['depth']['score']
-        alignment_score = analysis_results['alignment']['score']
-        
-        # Calculate weighted average
+        # Extract individual scores and calculate the weighted average, summed
+        # left to right so the rounded score doesn't depend on summation order
+        scores = tuple(float(analysis_results[name]['score']) for name in self._METRICS)
+        knee_tracking_score, back_angle_score, depth_score, alignment_score = scores
+        knee_tracking_weight, back_angle_weight, depth_weight, alignment_weight = self._weights
         overall_score = (
-            knee_tracking_score * self.weights['knee_tracking'] +
-            back_angle_score * self.weights['back_angle'] +
-            depth_score * self.weights['depth'] +
-            alignment_score * self.weights['alignment']
+            knee_tracking_score * knee_tracking_weight +
+            back_angle_score * back_angle_weight +
+            depth_score * depth_weight +
+            alignment_score * alignment_weight
         )
-        
-        # Round to nearest integer and convert to native Python int
-        overall_score = int(round(float(overall_score)))
+        overall_score = int(round(overall_score))
         
         # Determine letter rating
         rating = self._get_letter_rating(overall_score)
@@ -54,46 +59,26 @@ class RatingCalculator:
             overall_score, analysis_results
         )
         
+        # Round all metric scores at once (half to even, like round())
+        rounded = np.rint(scores).astype(int).tolist()
+        
         return {
-            'overall_score': int(overall_score),
+            'overall_score': overall_score,
             'rating': rating,
             'feedback': feedback,
             'breakdown': {
-                'knee_tracking': {
-                    'score': int(round(float(knee_tracking_score))),
-                    'weight': float(self.weights['knee_tracking']),
-                    'feedback': analysis_results['knee_tracking']['feedback']
-                },
-                'back_angle': {
-                    'score': int(round(float(back_angle_score))),
-                    'weight': float(self.weights['back_angle']),
-                    'feedback': analysis_results['back_angle']['feedback']
-                },
-                'depth': {
-                    'score': int(round(float(depth_score))),
-                    'weight': float(self.weights['depth']),
-                    'feedback': analysis_results['depth']['feedback']
-                },
-                'alignment': {
-                    'score': int(round(float(alignment_score))),
-                    'weight': float(self.weights['alignment']),
-                    'feedback': analysis_results['alignment']['feedback']
+                name: {
+                    'score': score,
+                    'weight': weight,
+                    'feedback': analysis_results[name]['feedback']
                 }
+                for name, score, weight in zip(self._METRICS, rounded, self._weights)
             }
         }
     
     def _get_letter_rating(self, score: float) -> str:
         """Convert numeric score to letter rating."""
-        if score >= 90:
-            return 'A'
-        elif score >= 80:
-            return 'B'
-        elif score >= 70:
-            return 'C'
-        elif score >= 60:
-            return 'D'
-        else:
-            return 'F'
+        return self._LETTER_RATINGS[min(10, max(0, int(score) // 10))]
     
     def _generate_comprehensive_feedback(self, overall_score: float, 
                                         analysis_results: Dict) -> str:
@@ -120,15 +105,15 @@ class RatingCalculator:
             'Alignment': analysis_results['alignment']['score']
         }
         
-        sorted_scores = sorted(scores.items(), key=lambda x: x[1])
-        weakest = sorted_scores[0]
+        # On ties the weakest is the first listed metric and the strongest the last
+        weakest = min(scores.items(), key=itemgetter(1))
         
         if weakest[1] < 70:
             feedback_parts.append(f"\nPriority Focus: {weakest[0]} is your weakest area (score: {weakest[1]:.0f}/100).")
             feedback_parts.append(f"  → {analysis_results[weakest[0].lower().replace(' ', '_')]['feedback']}")
         
         # Highlight strengths if any
-        strongest = sorted_scores[-1]
+        strongest = max(reversed(scores.items()), key=itemgetter(1))
         if strongest[1] >= 85:
             feedback_parts.append(f"\nStrength: {strongest[0]} is performing well (score: {strongest[1]:.0f}/100).")
         
@@ -0,0 +1,182 @@
+import cv2
+import numpy as np
+from typing import List, Optional
+
+# TensorRT and PyCUDA are optional; they are only needed for the tensorrt backend
+try:
+    import tensorrt as trt
+    import pycuda.autoinit  # noqa: F401 (creates the CUDA context)
+    import pycuda.driver as cuda
+    TENSORRT_AVAILABLE = True
+except ImportError:
+    TENSORRT_AVAILABLE = False
+
+# Input resolution of the MediaPipe pose landmark network
+INPUT_SIZE = 256
+
+# Engine outputs as named in pose_landmark_full.tflite, which tf2onnx keeps:
+# 39 points (33 body landmarks + 6 auxiliary) of (x, y, z, visibility, presence)
+# with x/y/z in input pixels and logit scores, and the pose flag, already a probability
+LANDMARKS_OUTPUT = 'ld_3d'
+PRESENCE_OUTPUT = 'output_poseflag'
+_NUM_OUTPUT_POINTS = 39
+_NUM_BODY_LANDMARKS = 33
+_POINT_SIZE = 5
+
+# Auxiliary points that locate the body for the next frame's crop: the body
+# center, and a point on the circle around the whole body
+_ROI_CENTER = 33
+_ROI_SCALE_POINT = 34
+
+# Crop side relative to the diameter of that circle (MediaPipe's ROI margin)
+_ROI_MARGIN = 1.25
+
+# Crops smaller than this many pixels are treated as a lost pose
+_MIN_ROI_SIZE = 16
+
+# Minimum pose presence probability for a frame to count as having a pose
+_MIN_PRESENCE = 0.5
+
+class Landmark:
+    """One normalized pose landmark, shaped like MediaPipe's NormalizedLandmark."""
+    __slots__ = ('x', 'y', 'z', 'visibility', 'presence')
+    
+    def __init__(self, x: float, y: float, z: float, visibility: float, presence: float):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+        self.presence = presence
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Convert logit scores to probabilities."""
+    return 1.0 / (1.0 + np.exp(-x))
+
+class TensorRTPoseModel:
+    """
+    Runs the MediaPipe pose landmark network from a prebuilt TensorRT engine.
+    
+    The engine is built offline from the pose_landmark_full.tflite graph
+    shipped with MediaPipe (TFLite -> ONNX with tf2onnx, then
+    `trtexec --onnx=pose.onnx --fp16 --saveEngine=pose.engine`). Buffers and
+    the CUDA stream are allocated once and reused for every frame.
+    
+    Like MediaPipe, the network runs on a square crop around the person,
+    tracked from the previous frame's auxiliary landmarks. Unlike MediaPipe
+    there is no person detector to find that crop: the first frame, and
+    every frame after the pose is lost, is letterboxed whole. That only
+    finds a lifter who fills a good part of the frame, so footage where the
+    person is small or off to the side needs a detector stage (e.g.
+    MediaPipe's pose detection model) in front of this one.
+    """
+    
+    def __init__(self, engine_path: str, landmarks_output: str = LANDMARKS_OUTPUT,
+                 presence_output: Optional[str] = PRESENCE_OUTPUT):
+        """
+        Load the engine and allocate its buffers.
+        
+        Args:
+            engine_path: Prebuilt TensorRT engine of the pose landmark network
+            landmarks_output: Name of the engine output holding the 39 landmark points
+            presence_output: Name of the pose flag output, or None if the engine has none
+        """
+        if not TENSORRT_AVAILABLE:
+            raise ImportError("The tensorrt backend requires the tensorrt and pycuda packages")
+        
+        logger = trt.Logger(trt.Logger.WARNING)
+        with open(engine_path, 'rb') as f:
+            self.engine = trt.Runtime(logger).deserialize_cuda_engine(f.read())
+        if self.engine is None:
+            raise ValueError(f"Could not load TensorRT engine: {engine_path}")
+        self.context = self.engine.create_execution_context()
+        self.stream = cuda.Stream()
+        
+        # Pinned host and device buffers for every engine tensor
+        self.host = {}
+        self.device = {}
+        self.input_name = None
+        for i in range(self.engine.num_io_tensors):
+            name = self.engine.get_tensor_name(i)
+            shape = tuple(self.engine.get_tensor_shape(name))
+            self.host[name] = cuda.pagelocked_empty(shape, trt.nptype(self.engine.get_tensor_dtype(name)))
+            self.device[name] = cuda.mem_alloc(self.host[name].nbytes)
+            self.context.set_tensor_address(name, int(self.device[name]))
+            
+            if self.engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT:
+                self.input_name = name
+        
+        # Pick the outputs by name: several outputs (e.g. the world landmarks) have similar shapes
+        for name in (landmarks_output, presence_output):
+            if name is not None and (name not in self.host or name == self.input_name):
+                outputs = sorted(n for n in self.host if n != self.input_name)
+                raise ValueError(f"{engine_path} has no output named {name!r} (outputs: {', '.join(outputs)})")
+        if self.input_name is None or self.host[landmarks_output].size != _NUM_OUTPUT_POINTS * _POINT_SIZE:
+            raise ValueError(f"{engine_path} is not a pose landmark engine")
+        self.landmarks_name = landmarks_output
+        self.presence_name = presence_output
+        
+        self._roi = None  # (center x, center y, side) in frame pixels of the tracked crop
+    
+    def reset(self):
+        """Forget the tracked crop, so the next frame is searched whole."""
+        self._roi = None
+    
+    def infer(self, rgb_frame: np.ndarray) -> Optional[List[Landmark]]:
+        """
+        Run the network on an RGB frame.
+        
+        Args:
+            rgb_frame: RGB frame from the video
+        
+        Returns:
+            List of the 33 body landmarks normalized to the frame, or None if no pose was found
+        """
+        # Crop the tracked square around the person into the network input, or
+        # letterbox the whole frame when no pose is being tracked
+        height, width = rgb_frame.shape[:2]
+        center_x, center_y, side = self._roi or (width / 2, height / 2, max(height, width))
+        scale = INPUT_SIZE / side
+        offset_x = INPUT_SIZE / 2 - center_x * scale
+        offset_y = INPUT_SIZE / 2 - center_y * scale
+        
+        # Parts of the crop outside the frame are black
+        crop = cv2.warpAffine(
+            rgb_frame, np.array([[scale, 0, offset_x], [0, scale, offset_y]]), (INPUT_SIZE, INPUT_SIZE),
+            flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT
+        )
+        model_input = self.host[self.input_name].reshape(INPUT_SIZE, INPUT_SIZE, 3)
+        np.multiply(crop, np.float32(1 / 255), out=model_input)
+        
+        cuda.memcpy_htod_async(self.device[self.input_name], self.host[self.input_name], self.stream)
+        self.context.execute_async_v3(self.stream.handle)
+        for name in (self.landmarks_name, self.presence_name):
+            if name is not None:
+                cuda.memcpy_dtoh_async(self.host[name], self.device[name], self.stream)
+        self.stream.synchronize()
+        
+        if self.presence_name is not None and self.host[self.presence_name].item() < _MIN_PRESENCE:
+            self._roi = None
+            return None
+        
+        # Map the points from the crop back to frame pixels
+        output = self.host[self.landmarks_name].reshape(_NUM_OUTPUT_POINTS, _POINT_SIZE)
+        xs = (output[:, 0] - offset_x) / scale
+        ys = (output[:, 1] - offset_y) / scale
+        
+        # Crop the next frame around where the body is now
+        radius = np.hypot(xs[_ROI_SCALE_POINT] - xs[_ROI_CENTER], ys[_ROI_SCALE_POINT] - ys[_ROI_CENTER])
+        roi_side = float(2 * radius * _ROI_MARGIN)
+        self._roi = (float(xs[_ROI_CENTER]), float(ys[_ROI_CENTER]), roi_side) if roi_side >= _MIN_ROI_SIZE else None
+        
+        # Normalize the body landmarks to the frame (z on the same scale as x)
+        points = output[:_NUM_BODY_LANDMARKS]
+        visibility = _sigmoid(points[:, 3])
+        presence = _sigmoid(points[:, 4])
+        
+        return [
+            Landmark(x, y, z, v, p)
+            for x, y, z, v, p in zip((xs[:_NUM_BODY_LANDMARKS] / width).tolist(),
+                                     (ys[:_NUM_BODY_LANDMARKS] / height).tolist(),
+                                     (points[:, 2] / (scale * width)).tolist(),
+                                     visibility.tolist(), presence.tolist())
+        ]
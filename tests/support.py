@@ -0,0 +1,91 @@
+"""Shared fixtures for the unit tests: synthetic videos and a stand-in pose model."""
+
+import os
+import cv2
+import numpy as np
+from types import SimpleNamespace
+from typing import List
+
+VIDEO_SIZE = (64, 48)  # (width, height)
+
+
+def write_video(path: str, levels: List[int], fps: float = 30.0) -> str:
+    """
+    Write a short MJPG video whose frames are flat gray images.
+    
+    Args:
+        path: Output .avi path
+        levels: Gray level (0-255) of each frame
+        fps: Frame rate stored in the container
+        
+    Returns:
+        The output path
+    """
+    width, height = VIDEO_SIZE
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (width, height))
+    for level in levels:
+        writer.write(np.full((height, width, 3), level, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+class FakePose:
+    """
+    Stand-in for mp.solutions.pose.Pose.
+    
+    Frames darker than gray level 10 have no pose; otherwise every landmark's y
+    follows the frame's brightness, so each frame gets distinct, repeatable
+    keypoints. Every third landmark is reported as not visible.
+    """
+    
+    def __init__(self, **kwargs):
+        self.calls = 0
+    
+    def reset(self):
+        pass
+    
+    def process(self, rgb_frame: np.ndarray):
+        self.calls += 1
+        level = float(rgb_frame.mean())
+        if level < 10:
+            return SimpleNamespace(pose_landmarks=None)
+        
+        landmarks = [
+            SimpleNamespace(x=(i + 1) / 40, y=level / 255, visibility=0.2 if i % 3 == 0 else 0.9)
+            for i in range(33)
+        ]
+        return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+
+class FakeLandmarker:
+    """Stand-in for a video-mode mp.tasks.vision.PoseLandmarker that records the timestamps it is fed."""
+    
+    def __init__(self):
+        self.timestamps = []
+    
+    def detect_for_video(self, image, timestamp_ms: int):
+        if self.timestamps and timestamp_ms <= self.timestamps[-1]:
+            raise ValueError('Input timestamp must be monotonically increasing.')
+        self.timestamps.append(timestamp_ms)
+        result = FakePose().process(image.numpy_view())
+        landmarks = result.pose_landmarks
+        return SimpleNamespace(pose_landmarks=[landmarks.landmark] if landmarks else [])
+    
+    def close(self):
+        pass
+
+
+# Enough of the mediapipe module for PoseDetector's legacy backend
+FAKE_MEDIAPIPE = SimpleNamespace(
+    solutions=SimpleNamespace(
+        pose=SimpleNamespace(Pose=FakePose, POSE_CONNECTIONS=frozenset({(11, 12), (11, 23), (12, 24), (23, 24)}))
+    )
+)
+
+# Environment variables that would switch PoseDetector to another backend
+BACKEND_ENV_VARS = ('SQUATFORM_POSE_MODEL', 'SQUATFORM_TENSORRT_ENGINE')
+
+
+def clean_backend_env() -> dict:
+    """Copy of os.environ without the backend selection variables."""
+    return {k: v for k, v in os.environ.items() if k not in BACKEND_ENV_VARS}
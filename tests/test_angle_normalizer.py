@@ -0,0 +1,168 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import angle_normalizer
+from angle_normalizer import AngleNormalizer, KEYPOINT_INDEX, KEYPOINT_NAMES
+from pose_detector import KeypointView
+
+
+def side_view_frames(num_frames=20, nose_offset=-0.05):
+    """
+    Keypoint dictionaries of a side view squat: the shoulders overlap and the
+    nose is nose_offset to the side of them (negative = facing left).
+    """
+    frames = []
+    for f in range(num_frames):
+        hip_y = 0.5 + 0.2 * np.sin(np.pi * f / (num_frames - 1))
+        frame = dict.fromkeys(KEYPOINT_NAMES)
+        frame.update({
+            'nose': (0.5 + nose_offset, 0.15),
+            'left_shoulder': (0.5, 0.25),
+            'right_shoulder': (0.51, 0.26),
+            'left_hip': (0.55, hip_y),
+            'right_hip': (0.56, hip_y),
+            'left_knee': (0.45, 0.7),
+            'right_ankle': (0.5, 0.9),
+        })
+        frames.append(frame)
+    return frames
+
+
+def front_view_frames(num_frames=10, nose_visible=True):
+    """Keypoint dictionaries of a front (or, without the nose, back) view: shoulders far apart and level."""
+    frames = []
+    for _ in range(num_frames):
+        frame = dict.fromkeys(KEYPOINT_NAMES)
+        frame.update({
+            'left_shoulder': (0.35, 0.3),
+            'right_shoulder': (0.65, 0.3),
+            'left_ankle': (0.4, 0.9),
+            'right_ankle': (0.6, 0.9),
+        })
+        if nose_visible:
+            frame['nose'] = (0.5, 0.2)
+        frames.append(frame)
+    return frames
+
+
+@unittest.skipUnless(angle_normalizer.NUMBA_AVAILABLE, 'numba is not installed')
+class ComputeStatsParityTest(unittest.TestCase):
+    
+    def assert_parity(self, coords, visible):
+        expected = angle_normalizer._compute_stats_numpy(coords, visible)
+        actual = angle_normalizer._compute_stats_numba(coords, visible)
+        self.assertEqual(len(actual), len(expected))
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)  # Also checks NaNs line up
+    
+    def test_random_samples(self):
+        rng = np.random.default_rng(0)
+        for visible_ratio in (0.2, 0.5, 0.9, 1.0):
+            for num_frames in (1, 16, 300):
+                with self.subTest(visible_ratio=visible_ratio, num_frames=num_frames):
+                    coords = rng.random((num_frames, len(KEYPOINT_NAMES), 2), dtype=np.float32)
+                    visible = rng.random((num_frames, len(KEYPOINT_NAMES))) < visible_ratio
+                    coords[~visible] = np.nan
+                    self.assert_parity(coords, visible)
+    
+    def test_nothing_visible(self):
+        coords = np.full((4, len(KEYPOINT_NAMES), 2), np.nan, dtype=np.float32)
+        visible = np.zeros((4, len(KEYPOINT_NAMES)), dtype=bool)
+        self.assert_parity(coords, visible)
+        self.assertTrue(np.isnan(angle_normalizer._compute_stats_numba(coords, visible)[0]))
+
+
+class DetectAndNormalizeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.normalizer = AngleNormalizer()
+    
+    def test_empty(self):
+        coords, visible = self.normalizer.detect_and_normalize([])
+        self.assertEqual(coords.shape, (0, len(KEYPOINT_NAMES), 2))
+        self.assertEqual(visible.shape, (0, len(KEYPOINT_NAMES)))
+        self.assertEqual(self.normalizer.get_angle_info(),
+                         {'view_angle': None, 'orientation': None, 'is_ideal': False, 'warning': None})
+    
+    def test_side_view_facing_left_is_unchanged(self):
+        frames = side_view_frames()
+        coords, visible = self.normalizer.detect_and_normalize(frames)
+        expected_coords, expected_visible = angle_normalizer.keypoints_to_array(frames)
+        
+        np.testing.assert_array_equal(coords, expected_coords)
+        np.testing.assert_array_equal(visible, expected_visible)
+        self.assertEqual(self.normalizer.get_angle_info(),
+                         {'view_angle': 'side_view', 'orientation': 'facing_left', 'is_ideal': True, 'warning': None})
+    
+    def test_side_view_facing_right_is_mirrored(self):
+        frames = side_view_frames(nose_offset=0.05)
+        coords, visible = self.normalizer.detect_and_normalize(frames)
+        self.assertEqual(self.normalizer.get_angle_info()['orientation'], 'facing_right')
+        
+        # x is mirrored and left/right joints swap places
+        for name, mirrored in (('nose', 'nose'), ('left_knee', 'right_knee'), ('right_ankle', 'left_ankle'),
+                               ('left_hip', 'right_hip')):
+            x, y = frames[3][name]
+            np.testing.assert_allclose(coords[3, KEYPOINT_INDEX[mirrored]], (1 - x, y), rtol=1e-6)
+            self.assertTrue(visible[3, KEYPOINT_INDEX[mirrored]])
+        self.assertFalse(visible[:, KEYPOINT_INDEX['left_knee']].any())
+        self.assertTrue(np.isnan(coords[:, KEYPOINT_INDEX['left_knee']]).all())
+    
+    def test_keypoint_view_input_is_not_modified(self):
+        coords, visible = angle_normalizer.keypoints_to_array(side_view_frames(nose_offset=0.05))
+        view = KeypointView(coords.copy(), visible.copy())
+        
+        normalized, _ = self.normalizer.detect_and_normalize(view)
+        self.assertEqual(self.normalizer.get_angle_info()['orientation'], 'facing_right')
+        np.testing.assert_array_equal(view.coords, coords)
+        self.assertFalse(np.array_equal(normalized, coords, equal_nan=True))
+    
+    def test_front_and_back_views(self):
+        self.normalizer.detect_and_normalize(front_view_frames())
+        info = self.normalizer.get_angle_info()
+        self.assertEqual(info['view_angle'], 'front_view')
+        self.assertFalse(info['is_ideal'])
+        self.assertIn('Front view detected', info['warning'])
+        
+        self.normalizer.detect_and_normalize(front_view_frames(nose_visible=False))
+        self.assertEqual(self.normalizer.get_angle_info()['view_angle'], 'back_view')
+    
+    def test_angle_info_is_a_copy(self):
+        self.normalizer.detect_and_normalize(front_view_frames())
+        self.normalizer.get_angle_info()['warning'] = None
+        self.assertIn('Front view detected', self.normalizer.get_angle_info()['warning'])
+    
+    def test_no_shoulders(self):
+        frames = [dict.fromkeys(KEYPOINT_NAMES, None) for _ in range(5)]
+        self.normalizer.detect_and_normalize(frames)
+        info = self.normalizer.get_angle_info()
+        self.assertEqual(info['view_angle'], 'unknown')
+        self.assertIsNone(info['orientation'])
+    
+    def test_detection_cache(self):
+        side, front = side_view_frames(nose_offset=0.05), front_view_frames()
+        collect_stats = mock.Mock(wraps=self.normalizer._collect_stats)
+        with mock.patch.object(self.normalizer, '_collect_stats', collect_stats):
+            first, _ = self.normalizer.detect_and_normalize(side)
+            self.normalizer.detect_and_normalize(front)
+            again, _ = self.normalizer.detect_and_normalize(side)
+        
+        # The repeated video reuses its detection and still gets normalized
+        self.assertEqual(collect_stats.call_count, 2)
+        self.assertEqual(self.normalizer.get_angle_info()['orientation'], 'facing_right')
+        np.testing.assert_array_equal(again, first)
+    
+    def test_detection_cache_evicts_oldest(self):
+        collect_stats = mock.Mock(wraps=self.normalizer._collect_stats)
+        with mock.patch.object(angle_normalizer, 'DETECTION_CACHE_SIZE', 1), \
+             mock.patch.object(self.normalizer, '_collect_stats', collect_stats):
+            self.normalizer.detect_and_normalize(side_view_frames())
+            self.normalizer.detect_and_normalize(front_view_frames())
+            self.normalizer.detect_and_normalize(side_view_frames())
+        self.assertEqual(collect_stats.call_count, 3)
+        self.assertEqual(len(self.normalizer._detection_cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
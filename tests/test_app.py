@@ -0,0 +1,87 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import app
+
+
+class FakeExecutor:
+    """Stand-in for the analysis process pool that runs nothing and can be made to break."""
+    
+    instances = []
+    
+    def __init__(self, max_workers=None, initializer=None):
+        self.max_workers = max_workers
+        self.broken = False
+        self.shut_down = False
+        FakeExecutor.instances.append(self)
+    
+    def submit(self, fn, filepath, filename):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool('A child process terminated abruptly'))
+        else:
+            future.set_result({'overall_score': 90, 'rating': 'A', 'video_filename': filename})
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class AnalyzePoolTest(unittest.TestCase):
+    
+    def setUp(self):
+        FakeExecutor.instances = []
+        self.upload_dir = tempfile.mkdtemp()
+        for patcher in (
+            mock.patch.object(app, 'ProcessPoolExecutor', FakeExecutor),
+            mock.patch.object(app, '_executor', None),
+            mock.patch.dict(app.app.config, {'UPLOAD_FOLDER': self.upload_dir}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app.app.test_client()
+    
+    def tearDown(self):
+        shutil.rmtree(self.upload_dir)
+    
+    def post_video(self):
+        return self.client.post(
+            '/analyze', data={'video': (io.BytesIO(b'video'), 'clip.mp4')}, content_type='multipart/form-data'
+        )
+    
+    def test_pool_started_on_first_analysis(self):
+        self.assertEqual(FakeExecutor.instances, [])
+        self.assertEqual(self.post_video().status_code, 200)
+        self.assertEqual(self.post_video().status_code, 200)
+        self.assertEqual(len(FakeExecutor.instances), 1)
+        self.assertEqual(FakeExecutor.instances[0].max_workers, os.cpu_count())
+    
+    def test_worker_count_from_environment(self):
+        with mock.patch.dict(os.environ, {app.WORKERS_ENV: '3'}):
+            self.post_video()
+        self.assertEqual(FakeExecutor.instances[0].max_workers, 3)
+    
+    def test_broken_pool_is_replaced(self):
+        self.post_video()
+        broken = FakeExecutor.instances[0]
+        broken.broken = True
+        
+        response = self.post_video()
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('terminated abruptly', response.get_json()['error'])
+        self.assertTrue(broken.shut_down)
+        
+        response = self.post_video()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(FakeExecutor.instances), 2)
+        self.assertFalse(FakeExecutor.instances[1].shut_down)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import pose_detector
+from form_analyzer import FormAnalyzer
+from support import FAKE_MEDIAPIPE, clean_backend_env, write_video
+
+# Gray levels of a synthetic squat: the hips (which follow the brightness
+# in the stand-in pose model) go down and come back up
+SQUAT_LEVELS = [60 + 8 * min(i, 24 - i) for i in range(25)]
+
+
+def make_analyzer() -> FormAnalyzer:
+    with mock.patch.object(pose_detector, 'mp', FAKE_MEDIAPIPE), \
+         mock.patch.dict(os.environ, clean_backend_env(), clear=True):
+        return FormAnalyzer()
+
+
+class SnapshotTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.video = write_video(os.path.join(self.tmpdir, 'squat.avi'), SQUAT_LEVELS)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_snapshots(self):
+        with make_analyzer() as analyzer:
+            result = analyzer.analyze_squat(self.video)
+        self.assertEqual(result['bottom_frame_idx'], 12)
+        self.assertEqual(result['last_frame_idx'], len(SQUAT_LEVELS) - 1)
+        self.assertEqual(result['processed_frames'], len(SQUAT_LEVELS))
+        self.assertIn('bottom', result['snapshots'])
+        self.assertEqual(result['snapshots']['bottom']['frame_idx'], 12)
+        self.assertTrue(result['snapshots']['bottom']['image'].startswith('data:image/jpeg;base64,'))
+    
+    def test_target_fps(self):
+        # 30 fps down to 6 fps processes every 5th frame, then refines around the coarse bottom
+        with make_analyzer() as analyzer:
+            result = analyzer.analyze_squat(self.video, include_snapshots=False, target_fps=6)
+        self.assertEqual(result['coarse_bottom_frame_idx'], 10)
+        self.assertEqual(result['bottom_frame_idx'], 12)
+        self.assertEqual(result['processed_frames'], 5 + 8)
+
+
+class ScoringTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.analyzer = make_analyzer()
+    
+    def back_angle_score(self, angle_deg):
+        # Hip at the origin, shoulder straight up 0.5 and leaning forward by the angle
+        shoulder = np.array([0.5 * np.tan(np.radians(angle_deg)), -0.5])
+        return self.analyzer._score_back_angle(shoulder, np.zeros(2))
+    
+    def test_back_angle_tiers(self):
+        for angle, expected in ((20, 100.0), (32, 85.0), (12, 85.0), (37, 70.0), (7, 70.0), (2, 50.0), (50, 25.0)):
+            with self.subTest(angle=angle):
+                score, feedback = self.back_angle_score(angle)
+                self.assertAlmostEqual(score, expected, places=6)
+                self.assertIn(f'{angle:.1f}°', feedback)
+    
+    def test_back_angle_missing(self):
+        self.assertEqual(self.analyzer._score_back_angle(None, np.zeros(2))[0], 0.0)
+    
+    def test_alignment(self):
+        score, feedback = self.analyzer._score_alignment((np.float32(95.0), np.float32(120.0)))
+        self.assertEqual(score, (100.0 + 70.0) / 2)
+        self.assertEqual(feedback, 'Left side: Excellent alignment | Right side: Moderate alignment issues')
+        
+        score, feedback = self.analyzer._score_alignment((float('nan'), 50.0))
+        self.assertEqual(score, 50.0)
+        self.assertEqual(feedback, 'Right side: Poor alignment (angle: 50.0°)')
+        
+        self.assertEqual(self.analyzer._score_alignment((float('nan'), float('nan')))[0], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+import form_kernels
+from angle_normalizer import KEYPOINT_NAMES
+
+
+def random_keypoints(num_frames: int, seed: int = 0, visible_ratio: float = 0.8):
+    """Random (F, K, 2) float32 keypoints with NaN where the (F, K) visibility mask is False."""
+    rng = np.random.default_rng(seed)
+    coords = rng.random((num_frames, len(KEYPOINT_NAMES), 2), dtype=np.float32)
+    visible = rng.random((num_frames, len(KEYPOINT_NAMES))) < visible_ratio
+    coords[~visible] = np.nan
+    return coords, visible
+
+
+@unittest.skipUnless(form_kernels.NUMBA_AVAILABLE, 'numba is not installed')
+class AverageKeypointsParityTest(unittest.TestCase):
+    
+    def test_parity(self):
+        for seed, visible_ratio in ((0, 0.9), (1, 0.3), (2, 0.02)):
+            with self.subTest(seed=seed, visible_ratio=visible_ratio):
+                coords, visible = random_keypoints(100, seed, visible_ratio)
+                expected = form_kernels._average_keypoints_numpy(coords, visible)
+                actual = form_kernels._average_keypoints_numba(coords, visible)
+                self.assertEqual(actual.dtype, expected.dtype)
+                np.testing.assert_allclose(actual, expected, rtol=1e-6)  # Also checks NaNs line up
+    
+    def test_never_visible(self):
+        coords, visible = random_keypoints(5, visible_ratio=0.0)
+        self.assertTrue(np.isnan(form_kernels._average_keypoints_numba(coords, visible)).all())
+
+
+class AverageKeypointsTest(unittest.TestCase):
+    
+    def test_mean_of_visible_frames(self):
+        coords, visible = random_keypoints(50, seed=3, visible_ratio=0.6)
+        average = form_kernels.average_keypoints(coords, visible)
+        self.assertEqual(average.shape, (len(KEYPOINT_NAMES), 2))
+        for k in range(len(KEYPOINT_NAMES)):
+            np.testing.assert_allclose(average[k], coords[visible[:, k], k].astype(np.float64).mean(axis=0), rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
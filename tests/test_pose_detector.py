@@ -0,0 +1,210 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+import pose_detector
+from angle_normalizer import keypoints_to_array
+from pose_detector import PoseDetector
+from support import FAKE_MEDIAPIPE, FakeLandmarker, clean_backend_env, write_video
+
+NUM_FRAMES = 12
+
+
+class ReportedCountCapture:
+    """Wraps a VideoCapture and reports a different container frame count."""
+    
+    def __init__(self, cap, frame_count):
+        self._cap = cap
+        self._frame_count = frame_count
+    
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self._frame_count
+        return self._cap.get(prop)
+    
+    def __getattr__(self, name):
+        return getattr(self._cap, name)
+
+
+class ProcessVideoFrameCountTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # Frame 0 has no pose, the rest get increasingly brighter
+        levels = [0] + [40 + 15 * i for i in range(NUM_FRAMES - 1)]
+        self.video = write_video(os.path.join(self.tmpdir, 'squat.avi'), levels)
+        
+        with mock.patch.object(pose_detector, 'mp', FAKE_MEDIAPIPE), \
+             mock.patch.dict(os.environ, clean_backend_env(), clear=True):
+            self.detector = PoseDetector()
+        self.expected = self.detector.process_video(self.video, return_frames=True)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def process_with_count(self, frame_count, **kwargs):
+        real_open = pose_detector.open_video
+        opened = []
+        
+        def open_video(path):
+            opened.append(path)
+            return ReportedCountCapture(real_open(path), frame_count)
+        
+        with mock.patch.object(pose_detector, 'open_video', open_video):
+            result = self.detector.process_video(self.video, **kwargs)
+        self.assertEqual(len(opened), 1)  # The count comes from the capture that decodes the frames
+        return result
+    
+    def test_reported_count_matches(self):
+        keypoints, frames = self.expected
+        self.assertEqual(len(keypoints), NUM_FRAMES)
+        self.assertEqual(len(frames), NUM_FRAMES)
+        self.assertFalse(keypoints.visible[0].any())
+        self.assertTrue(keypoints.visible[1:].any(axis=1).all())
+    
+    def test_mismatched_count(self):
+        expected_keypoints, expected_frames = self.expected
+        for frame_count in (5, NUM_FRAMES + 7, 10 ** 9, 0, -1, float('nan')):
+            with self.subTest(frame_count=frame_count):
+                keypoints, frames = self.process_with_count(frame_count, return_frames=True)
+                self.assertEqual(len(keypoints), NUM_FRAMES)
+                self.assertEqual(len(frames), NUM_FRAMES)
+                np.testing.assert_array_equal(keypoints.coords, expected_keypoints.coords)
+                np.testing.assert_array_equal(keypoints.visible, expected_keypoints.visible)
+                for frame, expected_frame in zip(frames, expected_frames):
+                    np.testing.assert_array_equal(frame, expected_frame)
+    
+    def test_mismatched_count_with_frame_step(self):
+        # 30 fps down to 10 fps processes every third frame
+        expected = self.detector.process_video(self.video, target_fps=10)
+        self.assertEqual(len(expected), 4)
+        np.testing.assert_array_equal(expected.coords, self.expected[0].coords[::3])
+        
+        for frame_count in (2, 100, 0):
+            with self.subTest(frame_count=frame_count):
+                keypoints = self.process_with_count(frame_count, target_fps=10)
+                np.testing.assert_array_equal(keypoints.coords, expected.coords)
+    
+    def test_preallocation_is_capped(self):
+        with mock.patch.object(pose_detector, 'MAX_PREALLOCATED_FRAMES', 3):
+            keypoints = self.process_with_count(10 ** 9)
+        np.testing.assert_array_equal(keypoints.coords, self.expected[0].coords)
+
+
+class ProcessVideoStreamTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        levels = [0, 0] + [40 + 15 * i for i in range(NUM_FRAMES - 2)]
+        self.video = write_video(os.path.join(self.tmpdir, 'squat.avi'), levels)
+        with mock.patch.object(pose_detector, 'mp', FAKE_MEDIAPIPE), \
+             mock.patch.dict(os.environ, clean_backend_env(), clear=True):
+            self.detector = PoseDetector()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_matches_process_video(self):
+        batch, batch_frames = self.detector.process_video(self.video, return_frames=True)
+        stream = list(self.detector.process_video_stream(self.video, return_frames=True))
+        
+        self.assertEqual([f.frame_idx for f in stream], list(range(NUM_FRAMES)))
+        # The batch keypoints are float32 arrays, the streamed ones dicts of Python floats
+        coords, visible = keypoints_to_array([f.keypoints for f in stream])
+        np.testing.assert_array_equal(coords, batch.coords)
+        np.testing.assert_array_equal(visible, batch.visible)
+        self.assertIsNone(stream[0].landmarks)
+        for frame, batch_frame in zip(stream, batch_frames):
+            np.testing.assert_array_equal(frame.annotated_frame, batch_frame)
+    
+    def test_frame_step_and_range(self):
+        frames = list(self.detector.process_video_stream(self.video, frame_step=3, start=2, stop=10))
+        self.assertEqual([f.frame_idx for f in frames], [2, 5, 8])
+        batch = self.detector.process_video(self.video)
+        np.testing.assert_array_equal(keypoints_to_array([f.keypoints for f in frames])[0], batch.coords[[2, 5, 8]])
+    
+    def test_closing_early_stops_the_reader(self):
+        stream = self.detector.process_video_stream(self.video)
+        next(stream)
+        stream.close()
+        self.assertEqual(len(list(self.detector.process_video_stream(self.video))), NUM_FRAMES)
+    
+    def test_landmarks_to_arrays(self):
+        stream = list(self.detector.process_video_stream(self.video))
+        coords, visible = self.detector.landmarks_to_arrays([f.landmarks for f in stream])
+        self.assertTrue(coords.flags['C_CONTIGUOUS'])
+        expected_coords, expected_visible = keypoints_to_array([f.keypoints for f in stream])
+        np.testing.assert_array_equal(coords, expected_coords)
+        np.testing.assert_array_equal(visible, expected_visible)
+
+
+class AnnotatedFrameTest(unittest.TestCase):
+    
+    def test_copy_flag(self):
+        with mock.patch.object(pose_detector, 'mp', FAKE_MEDIAPIPE), \
+             mock.patch.dict(os.environ, clean_backend_env(), clear=True):
+            detector = PoseDetector()
+        frame = np.full((48, 64, 3), 100, dtype=np.uint8)
+        _, landmarks = detector.detect_pose(frame)
+        
+        annotated = detector.get_annotated_frame(frame, landmarks)
+        self.assertTrue((frame == 100).all())
+        self.assertFalse((annotated == 100).all())
+        
+        in_place = detector.get_annotated_frame(frame, landmarks, copy=False)
+        self.assertIs(in_place, frame)
+        np.testing.assert_array_equal(in_place, annotated)
+
+
+class LandmarkerTimestampTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.landmarkers = []
+        
+        def create_from_options(options):
+            self.landmarkers.append(FakeLandmarker())
+            return self.landmarkers[-1]
+        
+        patcher = mock.patch.object(
+            pose_detector.mp.tasks.vision.PoseLandmarker, 'create_from_options', create_from_options
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.detector = PoseDetector(model_path='pose_landmarker_lite.task', use_gpu=False)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+    
+    def test_timestamps_follow_video_fps(self):
+        video = write_video(os.path.join(self.tmpdir, 'squat.avi'), [100] * 9, fps=25)
+        self.detector.process_video(video)
+        self.assertEqual(self.landmarkers[-1].timestamps, [40 * i for i in range(9)])
+    
+    def test_timestamps_follow_frame_step(self):
+        video = write_video(os.path.join(self.tmpdir, 'squat.avi'), [100] * 9, fps=30)
+        self.detector.process_video(video, target_fps=10)
+        self.assertEqual(self.landmarkers[-1].timestamps, [0, 100, 200])
+    
+    def test_stream_start_offset(self):
+        video = write_video(os.path.join(self.tmpdir, 'squat.avi'), [100] * 9, fps=50)
+        frames = list(self.detector.process_video_stream(video, start=4, stop=7))
+        self.assertEqual([f.frame_idx for f in frames], [4, 5, 6])
+        self.assertEqual(self.landmarkers[-1].timestamps, [80, 100, 120])
+    
+    def test_detect_pose_keeps_increasing(self):
+        video = write_video(os.path.join(self.tmpdir, 'squat.avi'), [100] * 3, fps=30)
+        self.detector.process_video(video)
+        frame = np.full((48, 64, 3), 100, dtype=np.uint8)
+        self.detector.detect_pose(frame)
+        self.detector.detect_pose(frame)
+        self.assertEqual(self.landmarkers[-1].timestamps, [0, 33, 67, 100, 133])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from rating_calculator import RatingCalculator
+
+
+def analysis(knee_tracking, back_angle, depth, alignment):
+    """Minimal FormAnalyzer.analyze_squat result with the given metric scores."""
+    scores = {'knee_tracking': knee_tracking, 'back_angle': back_angle, 'depth': depth, 'alignment': alignment}
+    return {name: {'score': score, 'feedback': f'{name} feedback'} for name, score in scores.items()}
+
+
+class WeightedScoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.calculator = RatingCalculator()
+    
+    def test_weighted_average(self):
+        # 100 * 0.25 + 85 * 0.25 + 60 * 0.30 + 100 * 0.20 = 84.25
+        rating = self.calculator.calculate_overall_rating(analysis(100, 85, 60, 100))
+        self.assertEqual(rating['overall_score'], 84)
+        self.assertIsInstance(rating['overall_score'], int)
+        self.assertEqual(rating['rating'], 'B')
+    
+    def test_half_point_rounds_to_even(self):
+        # 100 * 0.25 + 86 * 0.25 = 46.5 exactly
+        self.assertEqual(self.calculator.calculate_overall_rating(analysis(100, 86, 0, 0))['overall_score'], 46)
+        # 100 * 0.25 + 90 * 0.25 = 47.5 exactly
+        self.assertEqual(self.calculator.calculate_overall_rating(analysis(100, 90, 0, 0))['overall_score'], 48)
+    
+    def test_ordered_sum(self):
+        # Summed left to right this is 62.5 exactly and rounds to even; a dot product lands just above it
+        self.assertEqual(self.calculator.calculate_overall_rating(analysis(50, 95, 40.2, 70.95))['overall_score'], 62)
+    
+    def test_weights_sum_to_one(self):
+        self.assertEqual(self.calculator.calculate_overall_rating(analysis(100, 100, 100, 100))['overall_score'], 100)
+        self.assertEqual(self.calculator.calculate_overall_rating(analysis(0, 0, 0, 0))['overall_score'], 0)
+    
+    def test_breakdown(self):
+        rating = self.calculator.calculate_overall_rating(analysis(99.5, 84.5, 60.4, 100.0))
+        breakdown = rating['breakdown']
+        self.assertEqual([breakdown[name]['score'] for name in ('knee_tracking', 'back_angle', 'depth', 'alignment')], [100, 84, 60, 100])
+        self.assertEqual(sum(entry['weight'] for entry in breakdown.values()), 1.0)
+        self.assertEqual(breakdown['depth']['feedback'], 'depth feedback')
+    
+    def test_error(self):
+        rating = self.calculator.calculate_overall_rating({'error': 'No frames detected in video', 'score': 0})
+        self.assertEqual(rating, {'overall_score': 0, 'rating': 'F', 'feedback': 'No frames detected in video'})
+
+
+class LetterRatingTest(unittest.TestCase):
+    
+    def test_bands(self):
+        calculator = RatingCalculator()
+        for score, letter in ((100, 'A'), (90, 'A'), (89, 'B'), (80, 'B'), (79, 'C'), (70, 'C'),
+                              (69, 'D'), (60, 'D'), (59, 'F'), (0, 'F'), (-5, 'F'), (120, 'A')):
+            with self.subTest(score=score):
+                self.assertEqual(calculator._get_letter_rating(score), letter)
+
+
+class FeedbackTest(unittest.TestCase):
+    
+    def test_weakest_and_strongest_ties(self):
+        feedback = RatingCalculator().calculate_overall_rating(analysis(50, 90, 50, 90))['feedback']
+        # Ties go to the first listed metric for the weakest and the last for the strongest
+        self.assertIn('Priority Focus: Knee Tracking is your weakest area (score: 50/100).', feedback)
+        self.assertIn('  → knee_tracking feedback', feedback)
+        self.assertIn('Strength: Alignment is performing well (score: 90/100).', feedback)
+    
+    def test_no_priority_or_strength(self):
+        feedback = RatingCalculator().calculate_overall_rating(analysis(80, 80, 80, 80))['feedback']
+        self.assertEqual(feedback, 'Good squat form with minor areas for improvement.')
+
+
+if __name__ == '__main__':
+    unittest.main()
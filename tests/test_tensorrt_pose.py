@@ -0,0 +1,221 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+import tensorrt_pose
+from tensorrt_pose import INPUT_SIZE, TensorRTPoseModel
+
+
+class FakeDeviceBuffer:
+    """Device allocation of the fake CUDA driver; holds a host-side copy of the data."""
+    
+    _next_address = 1
+    
+    def __init__(self, nbytes):
+        self.data = None
+        self.address = FakeDeviceBuffer._next_address
+        FakeDeviceBuffer._next_address += 1
+    
+    def __int__(self):
+        return self.address
+
+
+def _memcpy_htod_async(device, host, stream):
+    device.data = np.array(host)
+
+def _memcpy_dtoh_async(host, device, stream):
+    host[...] = device.data
+
+
+FAKE_CUDA = SimpleNamespace(
+    Stream=lambda: SimpleNamespace(handle=0, synchronize=lambda: None),
+    pagelocked_empty=lambda shape, dtype: np.empty(shape, dtype=dtype),
+    mem_alloc=FakeDeviceBuffer,
+    memcpy_htod_async=_memcpy_htod_async,
+    memcpy_dtoh_async=_memcpy_dtoh_async,
+)
+
+
+class FakeContext:
+    """
+    Execution context running a stand-in pose network.
+    
+    The network finds the bright pixels of its input and puts every body
+    landmark at their center, the body center (point 33) there too and the
+    body circle point (point 34) half the bright area's height above it.
+    """
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.addresses = {}
+        self.inputs = []
+        self.presence = 1.0
+    
+    def set_tensor_address(self, name, address):
+        self.addresses[name] = address
+    
+    def execute_async_v3(self, stream_handle):
+        device = self.engine.model.device
+        image = device['input_1'].data.reshape(INPUT_SIZE, INPUT_SIZE, 3)
+        self.inputs.append(image.copy())
+        
+        ys, xs = np.nonzero(image[:, :, 0] > 0.5)
+        center_x, center_y = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+        points = np.zeros((39, 5), dtype=np.float32)
+        points[:, 0] = center_x
+        points[:, 1] = center_y
+        points[:, 3:] = 10.0  # Visibility and presence logits
+        points[34, 1] = center_y - (ys.max() - ys.min() + 1) / 2
+        
+        device['ld_3d'].data = points.reshape(1, 195)
+        device['world_3d'].data = np.zeros((1, 117), dtype=np.float32)
+        device['output_poseflag'].data = np.full((1, 1), self.presence, dtype=np.float32)
+        # Same size as the landmarks, so it can't be told apart by shape
+        device['decoy'].data = np.full((1, 195), -1, dtype=np.float32)
+
+
+class FakeEngine:
+    TENSORS = (
+        ('input_1', (1, INPUT_SIZE, INPUT_SIZE, 3), 'INPUT'),
+        ('decoy', (1, 195), 'OUTPUT'),
+        ('ld_3d', (1, 195), 'OUTPUT'),
+        ('output_poseflag', (1, 1), 'OUTPUT'),
+        ('world_3d', (1, 117), 'OUTPUT'),
+    )
+    
+    def __init__(self):
+        self.num_io_tensors = len(self.TENSORS)
+        self.model = None
+        self.context = None
+    
+    def get_tensor_name(self, i):
+        return self.TENSORS[i][0]
+    
+    def get_tensor_shape(self, name):
+        return dict((n, shape) for n, shape, _ in self.TENSORS)[name]
+    
+    def get_tensor_dtype(self, name):
+        return np.float32
+    
+    def get_tensor_mode(self, name):
+        return dict((n, mode) for n, _, mode in self.TENSORS)[name]
+    
+    def create_execution_context(self):
+        self.context = FakeContext(self)
+        return self.context
+
+
+class FakeRuntime:
+    engines = []
+    
+    def __init__(self, logger):
+        pass
+    
+    def deserialize_cuda_engine(self, data):
+        FakeRuntime.engines.append(FakeEngine())
+        return FakeRuntime.engines[-1]
+
+
+class FakeLogger:
+    WARNING = 2
+    
+    def __init__(self, level):
+        pass
+
+
+FAKE_TRT = SimpleNamespace(
+    Logger=FakeLogger,
+    Runtime=FakeRuntime,
+    TensorIOMode=SimpleNamespace(INPUT='INPUT', OUTPUT='OUTPUT'),
+    nptype=lambda dtype: dtype,
+)
+
+
+class TensorRTPoseModelTest(unittest.TestCase):
+    
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            tensorrt_pose, trt=FAKE_TRT, cuda=FAKE_CUDA, TENSORRT_AVAILABLE=True, create=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        fd, self.engine_path = tempfile.mkstemp(suffix='.engine')
+        os.close(fd)
+        self.addCleanup(os.remove, self.engine_path)
+    
+    def load(self, **kwargs) -> TensorRTPoseModel:
+        model = TensorRTPoseModel(self.engine_path, **kwargs)
+        FakeRuntime.engines[-1].model = model
+        return model
+    
+    @staticmethod
+    def frame_with_person(x0, y0, x1, y1, size=(640, 360)):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        frame[y0:y1, x0:x1] = 255
+        return frame
+    
+    def test_outputs_selected_by_name(self):
+        model = self.load()
+        self.assertEqual(model.landmarks_name, 'ld_3d')
+        self.assertEqual(model.presence_name, 'output_poseflag')
+        
+        landmarks = model.infer(self.frame_with_person(300, 100, 340, 260))
+        self.assertEqual(len(landmarks), 33)
+        self.assertGreater(landmarks[0].x, 0)  # Read from ld_3d, not the decoy
+    
+    def test_missing_output_name(self):
+        with self.assertRaisesRegex(ValueError, "no output named 'Identity'.*ld_3d"):
+            self.load(landmarks_output='Identity')
+        with self.assertRaisesRegex(ValueError, 'not a pose landmark engine'):
+            self.load(landmarks_output='world_3d')
+    
+    def test_landmarks_in_frame_coordinates(self):
+        model = self.load()
+        frame = self.frame_with_person(400, 120, 440, 280)
+        for _ in range(3):  # Whole frame first, then the tracked crop
+            landmark = model.infer(frame)[0]
+            self.assertAlmostEqual(landmark.x, 420 / 640, delta=2 / 640)
+            self.assertAlmostEqual(landmark.y, 200 / 360, delta=2 / 360)
+            self.assertGreater(landmark.visibility, 0.99)
+    
+    def test_crop_follows_person(self):
+        model = self.load()
+        context = FakeRuntime.engines[-1].context
+        model.infer(self.frame_with_person(400, 120, 440, 280))
+        self.assertIsNotNone(model._roi)
+        model.infer(self.frame_with_person(400, 120, 440, 280))
+        
+        # The whole frame is scaled by 256/640, the crop by 256/(160 * 1.25)
+        heights = [(image[:, :, 0] > 0.5).any(axis=1).sum() for image in context.inputs]
+        self.assertAlmostEqual(heights[0], 160 * INPUT_SIZE / 640, delta=2)
+        self.assertAlmostEqual(heights[1], INPUT_SIZE / 1.25, delta=2)
+    
+    def test_lost_pose_and_reset_search_whole_frame(self):
+        model = self.load()
+        context = FakeRuntime.engines[-1].context
+        frame = self.frame_with_person(400, 120, 440, 280)
+        
+        model.infer(frame)
+        context.presence = 0.1
+        self.assertIsNone(model.infer(frame))
+        self.assertIsNone(model._roi)
+        
+        context.presence = 1.0
+        model.infer(frame)
+        self.assertIsNotNone(model._roi)
+        model.reset()
+        self.assertIsNone(model._roi)
+    
+    def test_no_presence_output(self):
+        model = self.load(presence_output=None)
+        self.assertIsNone(model.presence_name)
+        self.assertEqual(len(model.infer(self.frame_with_person(300, 100, 340, 260))), 33)
+
+
+if __name__ == '__main__':
+    unittest.main()